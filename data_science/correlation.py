@@ -0,0 +1,228 @@
+"""
+correlation.py
+--------------
+Pearson and Spearman correlation matrices for wide tables.
+Covers: columns standardised once and multiplied in float32, column-blocked Gram products
+spread over threads (BLAS releases the GIL), pairwise-complete handling of missing values
+with four Gram products instead of a per-pair loop, Spearman via a one-time rank transform,
+and a mergeable accumulator for streaming row chunks.
+
+For columns ``i`` and ``j`` over the rows where both are present, with ``z`` the
+standardised values (0 where missing) and ``m`` the presence mask::
+
+    N = m^T m    S = z^T m    Q = (z*z)^T m    P = z^T z
+    corr = (N*P - S*S^T) / sqrt((N*Q - S*S) * (N*Q - S*S)^T)
+
+which is exactly ``DataFrame.corr()``'s pairwise-complete Pearson. Without missing values
+only ``P`` needs a matrix product.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+BLOCK_COLUMNS = 512
+ROW_CHUNK = 65536
+NUMERIC = ['number', 'bool']  # the columns DataFrame.corr(numeric_only=True) keeps
+
+
+# 1. BLOCKED GRAM PRODUCTS
+
+def blocked_gram(A: np.ndarray, B: Optional[np.ndarray] = None, block_size: int = BLOCK_COLUMNS,
+                 n_jobs: Optional[int] = 1) -> np.ndarray:
+    """``A.T @ B`` in float64, optionally computed as column blocks across a thread pool.
+
+    With ``B=None`` the product is symmetric and only the upper block triangle is computed.
+    A multithreaded BLAS already uses every core for one product, so the pool is opt-in
+    (``n_jobs > 1`` or ``None``) and only pays off with a single-threaded BLAS.
+    """
+    symmetric = B is None
+    A = np.asfortranarray(A)
+    B = A if symmetric else np.asfortranarray(B)
+    p, q = A.shape[1], B.shape[1]
+    if n_jobs == 1 or max(p, q) <= block_size:
+        return (A.T @ B).astype(np.float64)
+    out = np.empty((p, q), dtype=np.float64)
+
+    def work(task):
+        i, j = task
+        block = A[:, i:i + block_size].T @ B[:, j:j + block_size]
+        out[i:i + block_size, j:j + block_size] = block
+        if symmetric and i != j:
+            out[j:j + block_size, i:i + block_size] = block.T
+
+    tasks = [(i, j) for i in range(0, p, block_size) for j in range(i if symmetric else 0, q, block_size)]
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        list(pool.map(work, tasks))
+    return out
+
+
+# 2. MERGEABLE ACCUMULATOR
+
+class CorrelationAccumulator:
+    """Pairwise-complete Pearson sums over row chunks; ``merge`` combines partial results.
+
+    Values are standardised as ``(x - shift) / scale`` before the float32 products. Without an
+    explicit ``shift``/``scale`` they are taken from the first chunk, which keeps the sums well
+    conditioned; accumulators can only be merged when they share them (see ``empty_like``).
+    """
+
+    def __init__(self, columns: Optional[list] = None, shift: Optional[np.ndarray] = None,
+                 scale: Optional[np.ndarray] = None, dtype=np.float32, block_size: int = BLOCK_COLUMNS,
+                 n_jobs: Optional[int] = 1):
+        self.columns = columns
+        self.shift = None if shift is None else np.asarray(shift, dtype=np.float64)
+        self.scale = None if scale is None else np.asarray(scale, dtype=np.float64)
+        self.dtype = dtype
+        self.block_size = block_size
+        self.n_jobs = n_jobs
+        self.N = self.S = self.Q = self.P = None
+
+    def empty_like(self) -> 'CorrelationAccumulator':
+        """A fresh accumulator with the same columns, shift and scale, for merging later."""
+        return CorrelationAccumulator(self.columns, self.shift, self.scale, self.dtype, self.block_size, self.n_jobs)
+
+    def _as_array(self, chunk) -> np.ndarray:
+        if isinstance(chunk, pd.DataFrame):
+            if self.columns is None:
+                self.columns = list(chunk.select_dtypes(NUMERIC).columns)
+            return chunk[self.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.asarray(chunk, dtype=np.float64)
+
+    def update(self, chunk) -> 'CorrelationAccumulator':
+        X = self._as_array(chunk)
+        if len(X) == 0:
+            return self
+        if self.shift is None:
+            self.shift = np.nan_to_num(np.nanmean(X, axis=0)) if np.isnan(X).any() else X.mean(axis=0)
+        if self.scale is None:
+            std = np.nanstd(X, axis=0) if np.isnan(X).any() else X.std(axis=0)
+            self.scale = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        if self.P is None:
+            p = X.shape[1]
+            self.N, self.S, self.Q, self.P = (np.zeros((p, p)) for _ in range(4))
+        Z = ((X - self.shift) / self.scale).astype(self.dtype)
+        missing = np.isnan(Z)
+        gram = lambda A, B=None: blocked_gram(A, B, self.block_size, self.n_jobs)
+        if missing.any():
+            Z[missing] = 0
+            M = (~missing).astype(self.dtype)
+            self.N += gram(M)
+            self.S += gram(Z, M)
+            self.Q += gram(Z * Z, M)
+        else:
+            # every pair sees every row: the count and sum matrices are rank-one
+            self.N += len(Z)
+            self.S += Z.sum(axis=0, dtype=np.float64)[:, None]
+            self.Q += (Z.astype(np.float64) ** 2).sum(axis=0)[:, None]
+        self.P += gram(Z)
+        return self
+
+    def merge(self, other: 'CorrelationAccumulator') -> 'CorrelationAccumulator':
+        if other.P is None:
+            return self
+        if self.P is None:
+            self.N, self.S, self.Q, self.P = (m.copy() for m in (other.N, other.S, other.Q, other.P))
+            self.shift, self.scale, self.columns = other.shift, other.scale, self.columns or other.columns
+            return self
+        if not (np.array_equal(self.shift, other.shift) and np.array_equal(self.scale, other.scale)):
+            raise ValueError('Accumulators must share shift and scale to be merged; create them with empty_like()')
+        self.N += other.N
+        self.S += other.S
+        self.Q += other.Q
+        self.P += other.P
+        return self
+
+    def result(self, min_periods: int = 1):
+        """Correlation matrix (DataFrame when columns are known); NaN for pairs with too few rows."""
+        if self.P is None:
+            raise ValueError('No rows have been accumulated')
+        N, S, Q, P = self.N, self.S, self.Q, self.P
+        var = N * Q - S * S
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = (N * P - S * S.T) / np.sqrt(var * var.T)
+        corr[(N < max(min_periods, 2)) | ~(var > 0) | ~(var.T > 0)] = np.nan
+        diagonal = np.diag(var) > 0
+        corr[np.diag_indices_from(corr)] = np.where(diagonal & (np.diag(N) >= max(min_periods, 2)), 1.0, np.nan)
+        corr = np.clip(corr, -1, 1)
+        if self.columns is None:
+            return corr
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+# 3. ENTRY POINTS
+
+def rank_transform(X) -> np.ndarray:
+    """Average ranks per column, missing values kept missing (the Spearman input)."""
+    return pd.DataFrame(np.asarray(X, dtype=np.float64)).rank(method='average').to_numpy()
+
+
+def correlate(data, method: str = 'pearson', min_periods: int = 1, dtype=np.float32,
+              block_size: int = BLOCK_COLUMNS, row_chunk: int = ROW_CHUNK, n_jobs: Optional[int] = 1):
+    """Pearson or Spearman correlation of the numeric and bool columns of ``data`` (frame or 2-D array).
+
+    Column means and standard deviations are computed once in float64, so every row chunk is
+    standardised identically before the float32 products. Spearman ranks each column once
+    over its own non-missing rows; with missing values this differs slightly from pandas,
+    which re-ranks every pair over their shared rows.
+    """
+    columns = None
+    if isinstance(data, pd.DataFrame):
+        data = data.select_dtypes(NUMERIC)
+        columns = list(data.columns)
+        data = data.to_numpy(dtype=np.float64, na_value=np.nan)
+    X = np.asarray(data, dtype=np.float64)
+    if method == 'spearman':
+        X = rank_transform(X)
+    elif method != 'pearson':
+        raise ValueError("method must be 'pearson' or 'spearman', got {!r}".format(method))
+    has_missing = np.isnan(X).any()
+    shift = np.nan_to_num(np.nanmean(X, axis=0)) if has_missing else X.mean(axis=0)
+    std = np.nanstd(X, axis=0) if has_missing else X.std(axis=0)
+    accumulator = CorrelationAccumulator(columns, shift, np.where(std > 0, std, 1.0), dtype, block_size, n_jobs)
+    for start in range(0, len(X), row_chunk):
+        accumulator.update(X[start:start + row_chunk])
+    return accumulator.result(min_periods)
+
+
+def correlate_chunks(chunks: Iterable, columns: Optional[list] = None, min_periods: int = 1,
+                     **kwargs) -> pd.DataFrame:
+    """Pearson correlation over an iterable of row chunks in a single pass."""
+    accumulator = CorrelationAccumulator(columns, **kwargs)
+    for chunk in chunks:
+        accumulator.update(chunk)
+    return accumulator.result(min_periods)
+
+
+# 4. BENCHMARK
+
+def benchmark_correlation(n_rows: int = 10000, n_features: int = 500, missing: float = 0.0,
+                          random_state: int = 0) -> pd.DataFrame:
+    """``DataFrame.corr`` vs ``correlate`` (Pearson and Spearman): seconds and max abs difference."""
+    rng = np.random.default_rng(random_state)
+    latent = rng.standard_normal((n_rows, 10))
+    X = latent @ rng.standard_normal((10, n_features)) + rng.standard_normal((n_rows, n_features))
+    if missing:
+        X[rng.random(X.shape) < missing] = np.nan
+    frame = pd.DataFrame(X, columns=['f{}'.format(i) for i in range(n_features)])
+    rows = []
+    for method in ('pearson', 'spearman'):
+        start = time.perf_counter()
+        expected = frame.corr(method=method)
+        pandas_s = time.perf_counter() - start
+        start = time.perf_counter()
+        ours = correlate(frame, method=method)
+        engine_s = time.perf_counter() - start
+        rows.append({'method': method, 'pandas_s': pandas_s, 'engine_s': engine_s, 'speedup': pandas_s / engine_s,
+                     'max_abs_diff': float(np.nanmax(np.abs(expected.to_numpy() - ours.to_numpy())))})
+    return pd.DataFrame(rows).set_index('method')
+
+
+if __name__ == "__main__":
+    print("--- Correlation Engine ---")
+    print(benchmark_correlation(10000, 500).round(4))
+    print('With 5% missing values:')
+    print(benchmark_correlation(2000, 150, missing=0.05).round(4))
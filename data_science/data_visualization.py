@@ -2,13 +2,25 @@
 data_visualization.py
 ---------------------
 Comprehensive data visualization examples for data science in Python.
-Covers: matplotlib, seaborn, pandas plotting, and plotly basics.
+Covers: matplotlib, seaborn, pandas plotting, and plotly basics, plus headless plot specs for batch rendering.
 """
 
+import os
+import sys
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
+
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_science.lazy_imports import lazy_import
+
+# Each plotting library is imported on first use, so callers only pay for the backends they call
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+px = lazy_import('plotly.express')
 
 # Matplotlib example
 def plot_line():
@@ -38,11 +50,29 @@ def plot_pandas():
     plt.show()
 
 # Plotly example
-def plot_plotly():
-    """Plot an interactive scatter plot with plotly."""
+def plot_plotly(path=None):
+    """Plot an interactive WebGL scatter plot with plotly; with ``path``, write compact offline HTML instead."""
+    from data_science.plotly_export import export_html, scatter_figure
     df = px.data.iris()
-    fig = px.scatter(df, x='sepal_width', y='sepal_length', color='species', title='Iris Sepal Dimensions')
-    fig.show()
+    fig = scatter_figure(df, 'sepal_width', 'sepal_length', color='species', title='Iris Sepal Dimensions')
+    if path is not None:
+        export_html(fig, path)
+    else:
+        fig.show()
+    return fig
+
+# Headless specs for data_science.figure_renderer
+def figure_specs():
+    """The matplotlib/seaborn/pandas examples above as plot specs for ``render_batch``."""
+    from sklearn.datasets import load_iris
+    sepal_length = load_iris().data[:, 0]
+    return [
+        {'name': 'line_chart', 'kind': 'line', 'x': [1, 2, 3, 4], 'y': [10, 20, 25, 30], 'marker': 'o',
+         'title': 'Line Chart', 'xlabel': 'X', 'ylabel': 'Y'},
+        {'name': 'sepal_length_histogram', 'kind': 'hist', 'values': sepal_length, 'bins': 20,
+         'title': 'Sepal Length Distribution', 'xlabel': 'sepal_length', 'ylabel': 'Count'},
+        {'name': 'bar_plot', 'kind': 'bar', 'x': [0, 1, 2, 3], 'y': [1, 3, 2, 4], 'title': 'Bar Plot'},
+    ]
 
 if __name__ == "__main__":
     print("--- Data Visualization Examples ---")
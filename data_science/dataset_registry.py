@@ -0,0 +1,262 @@
+"""
+dataset_registry.py
+-------------------
+Load-once registry for the scikit-learn toy datasets and the CSV/JSON files under ``datasets/``.
+Covers: one load per process, an opt-in binary on-disk copy (``.npy`` / pickle) that skips
+sklearn's CSV parsing on later runs, read-only array and DataFrame views, and train/test split
+indices cached per (dataset, test_size, seed).
+
+Nothing is written to disk unless a ``cache_dir`` is given or the ``DATA_SCIENCE_CACHE``
+environment variable names one (e.g. ``DATA_SCIENCE_CACHE=~/.cache/data_science``).
+"""
+
+import json
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.datasets import load_breast_cancer, load_diabetes, load_digits, load_iris, load_wine
+from sklearn.model_selection import train_test_split
+
+SKLEARN_DATASETS = {
+    'iris': load_iris,
+    'wine': load_wine,
+    'digits': load_digits,
+    'diabetes': load_diabetes,
+    'breast_cancer': load_breast_cancer,
+}
+
+REPO_DATASETS = {
+    'housing': 'housing.csv',
+    'iris_csv': 'iris.csv',
+    'mnist_sample': 'mnist_sample.csv',
+    'sales': 'sales.json',
+    'titanic': 'titanic.csv',
+    'weather': 'weather.csv',
+}
+
+DATASETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'datasets')
+
+
+def default_cache_dir() -> Optional[str]:
+    """``$DATA_SCIENCE_CACHE`` (user-expanded), or None to keep datasets in memory only."""
+    directory = os.environ.get('DATA_SCIENCE_CACHE')
+    return os.path.expanduser(directory) if directory else None
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    view = np.asarray(array).view()
+    view.flags.writeable = False
+    return view
+
+
+# 1. REGISTRY
+
+class DatasetRegistry:
+    """Per-process dataset cache, optionally backed by a binary copy in ``cache_dir``.
+
+    Without a ``cache_dir`` (and no ``DATA_SCIENCE_CACHE``) datasets are only cached in memory.
+    Arrays are handed out as read-only views of one shared buffer; DataFrames are shallow
+    copies of one cached frame, so under pandas copy-on-write a caller's edits never reach
+    the cache. Disk writes are best-effort: an unwritable cache directory only disables the
+    on-disk copy.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.use_disk = self.cache_dir is not None
+        self._arrays = {}
+        self._frames = {}
+        self._tables = {}
+        self._splits = {}
+        self._lock = threading.RLock()
+        self.loads = 0  # datasets built from the original source (sklearn loader or CSV)
+
+    def _path(self, *parts) -> str:
+        return os.path.join(self.cache_dir, 'sklearn-' + sklearn.__version__, *parts)
+
+    # -- sklearn toy datasets --
+
+    def arrays(self, name: str) -> tuple:
+        """Read-only ``(X, y)`` arrays of a scikit-learn toy dataset."""
+        with self._lock:
+            if name not in self._arrays:
+                self._arrays[name] = self._load_arrays(name)
+            X, y, _ = self._arrays[name]
+        return X.view(), y.view()
+
+    def metadata(self, name: str) -> dict:
+        """Feature names, target name and target names of a toy dataset."""
+        self.arrays(name)
+        return dict(self._arrays[name][2])
+
+    def _load_arrays(self, name: str) -> tuple:
+        if name not in SKLEARN_DATASETS:
+            raise KeyError('Unknown dataset {!r}; choose from {}'.format(name, sorted(SKLEARN_DATASETS)))
+        if self.use_disk:
+            directory = self._path(name)
+            meta_path = os.path.join(directory, 'meta.json')
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    meta = json.load(f)
+                X = np.load(os.path.join(directory, 'X.npy'), mmap_mode='r')
+                y = np.load(os.path.join(directory, 'y.npy'), mmap_mode='r')
+                return _read_only(X), _read_only(y), meta
+
+        bunch = SKLEARN_DATASETS[name](as_frame=True)
+        X, y = bunch.data.to_numpy(), bunch.target.to_numpy()
+        meta = {
+            'feature_names': list(bunch.feature_names),
+            'target_name': bunch.target.name,
+            'target_names': [str(t) for t in bunch.get('target_names', [])],
+        }
+        self.loads += 1
+        if self.use_disk:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                np.save(os.path.join(directory, 'X.npy'), np.ascontiguousarray(X))
+                np.save(os.path.join(directory, 'y.npy'), np.ascontiguousarray(y))
+                with open(meta_path, 'w') as f:  # written last: marks the copy complete
+                    json.dump(meta, f)
+            except OSError:
+                pass
+        return _read_only(X), _read_only(y), meta
+
+    def frames(self, name: str) -> tuple:
+        """``(X, y)`` as a DataFrame and Series, matching ``load_*(as_frame=True)``."""
+        with self._lock:
+            if name not in self._frames:
+                X, y = self.arrays(name)
+                meta = self._arrays[name][2]
+                self._frames[name] = (pd.DataFrame(X, columns=meta['feature_names'], copy=False),
+                                      pd.Series(y, name=meta['target_name'], copy=False))
+            X, y = self._frames[name]
+        return X.copy(deep=False), y.copy(deep=False)
+
+    # -- repository files --
+
+    def table(self, name: str) -> pd.DataFrame:
+        """One of the ``datasets/`` files as a DataFrame; the pickled copy is keyed by file mtime."""
+        with self._lock:
+            if name not in self._tables:
+                self._tables[name] = self._load_table(name)
+            frame = self._tables[name]
+        return frame.copy(deep=False)
+
+    def _load_table(self, name: str) -> pd.DataFrame:
+        if name not in REPO_DATASETS:
+            raise KeyError('Unknown dataset {!r}; choose from {}'.format(name, sorted(REPO_DATASETS)))
+        source = os.path.join(DATASETS_DIR, REPO_DATASETS[name])
+        if self.use_disk:
+            stat = os.stat(source)
+            cached = self._path('tables', '{}-{}-{}.pkl'.format(name, stat.st_size, stat.st_mtime_ns))
+            if os.path.exists(cached):
+                return pd.read_pickle(cached)
+        frame = pd.read_json(source) if source.endswith('.json') else pd.read_csv(source)
+        self.loads += 1
+        if self.use_disk:
+            try:
+                os.makedirs(os.path.dirname(cached), exist_ok=True)
+                frame.to_pickle(cached)
+            except OSError:
+                pass
+        return frame
+
+    # -- split indices --
+
+    def split_indices(self, name: str, test_size: float = 0.2, random_state: int = 42,
+                      stratify: bool = False) -> tuple:
+        """Read-only ``(train_idx, test_idx)``, identical to ``train_test_split`` on the full data."""
+        key = (name, float(test_size), random_state, bool(stratify))
+        with self._lock:
+            if key not in self._splits:
+                self._splits[key] = self._load_split(name, *key[1:])
+            return self._splits[key]
+
+    def _load_split(self, name: str, test_size: float, random_state: int, stratify: bool) -> tuple:
+        if self.use_disk:
+            path = self._path(name, 'split-{}-{}-{}.npz'.format(test_size, random_state, int(stratify)))
+            if os.path.exists(path):
+                with np.load(path) as saved:
+                    return _read_only(saved['train']), _read_only(saved['test'])
+        _, y = self.arrays(name)
+        train, test = train_test_split(np.arange(len(y)), test_size=test_size, random_state=random_state,
+                                       stratify=y if stratify else None)
+        if self.use_disk:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                np.savez(path, train=train, test=test)
+            except OSError:
+                pass
+        return _read_only(train), _read_only(test)
+
+    def split(self, name: str, test_size: float = 0.2, random_state: int = 42, as_frame: bool = False,
+              stratify: bool = False) -> list:
+        """``X_train, X_test, y_train, y_test`` from the cached indices."""
+        train, test = self.split_indices(name, test_size, random_state, stratify)
+        if as_frame:
+            X, y = self.frames(name)
+            return [X.iloc[train], X.iloc[test], y.iloc[train], y.iloc[test]]
+        X, y = self.arrays(name)
+        return [X[train], X[test], y[train], y[test]]
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the in-process cache (and the on-disk copy with ``disk=True``)."""
+        with self._lock:
+            self._arrays.clear()
+            self._frames.clear()
+            self._tables.clear()
+            self._splits.clear()
+        if disk and self.use_disk:
+            import shutil
+            shutil.rmtree(self._path(), ignore_errors=True)
+
+
+# 2. MODULE-LEVEL SHORTCUTS
+
+registry = DatasetRegistry()
+
+
+def get_arrays(name: str) -> tuple:
+    """Read-only ``(X, y)`` arrays from the shared registry."""
+    return registry.arrays(name)
+
+
+def get_frame(name: str) -> tuple:
+    """``(X, y)`` DataFrame/Series from the shared registry."""
+    return registry.frames(name)
+
+
+def get_table(name: str) -> pd.DataFrame:
+    """A ``datasets/`` file from the shared registry."""
+    return registry.table(name)
+
+
+def get_split(name: str, test_size: float = 0.2, random_state: int = 42, as_frame: bool = False,
+              stratify: bool = False) -> list:
+    """Train/test split of a toy dataset using cached indices."""
+    return registry.split(name, test_size=test_size, random_state=random_state, as_frame=as_frame,
+                          stratify=stratify)
+
+
+if __name__ == "__main__":
+    import time
+
+    print("--- Dataset Registry ---")
+    for name in SKLEARN_DATASETS:
+        start = time.perf_counter()
+        sklearn_loaded = SKLEARN_DATASETS[name](return_X_y=True)
+        loader_s = time.perf_counter() - start
+        start = time.perf_counter()
+        X, y = get_arrays(name)
+        first_s = time.perf_counter() - start
+        start = time.perf_counter()
+        get_arrays(name)
+        again_s = time.perf_counter() - start
+        print('{:<14} sklearn {:.4f}s | registry first {:.4f}s | cached {:.6f}s | same data: {}'.format(
+            name, loader_s, first_s, again_s, np.array_equal(X, sklearn_loaded[0])))
+    X_train, X_test, y_train, y_test = get_split('iris')
+    print('iris split:', X_train.shape, X_test.shape, '| read-only:', not get_arrays('iris')[0].flags.writeable)
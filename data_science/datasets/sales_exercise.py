@@ -3,10 +3,22 @@ Sales JSON Exercise
 -------------------
 Practice loading and analyzing sales data from JSON.
 """
+import os
+import sys
+
 import pandas as pd
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from data_science.group_aggregate import aggregate_stream, read_records
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sales.json')
+
 # 1. Load the dataset
-sales = pd.read_json('sales.json')
+sales = pd.read_json(DATA)
 print(sales.head())
 
 # 2. Total revenue
@@ -14,3 +26,7 @@ print('Total revenue:', sales['revenue'].sum())
 
 # 3. Revenue by item
 print(sales.groupby('item')['revenue'].sum())
+
+# 4. The same rollup over a record stream, without holding the data in memory
+# (read_records also streams .csv and .jsonl files chunk by chunk)
+print(aggregate_stream(read_records(DATA), 'item', {'revenue': ['sum', 'mean', 'max'], 'units': ['sum']}))
@@ -3,17 +3,35 @@ Weather Dataset Exercise
 ------------------------
 Practice time series analysis and visualization.
 """
+import os
+import sys
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from data_science.streaming_timeseries import resample_stream, rolling_stream
+from data_science.timeseries_plots import plot_timeseries
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'weather.csv')
+
 # 1. Load the dataset
-weather = pd.read_csv('weather.csv')
+weather = pd.read_csv(DATA)
 print(weather.head())
 
-# 2. Plot temperature over time
+# 2. Plot temperature over time (long series are downsampled to the plot's pixel width)
 weather['date'] = pd.to_datetime(weather['date'])
-plt.plot(weather['date'], weather['temperature'])
+plot_timeseries(weather['date'], weather['temperature'], ax=plt.gca())
 plt.xlabel('Date')
 plt.ylabel('Temperature')
 plt.title('Temperature Over Time')
 plt.show()
+
+# 3. Resampled and rolling statistics (the same calls stream chunk by chunk for feeds too big for memory)
+daily = weather.set_index('date')[['temperature', 'humidity']]
+print(resample_stream(daily, '2D', aggs=('mean', 'min', 'max')))
+print(pd.concat(rolling_stream(daily, '3D', aggs=('mean', 'std'))))
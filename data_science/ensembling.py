@@ -0,0 +1,236 @@
+"""
+ensembling.py
+-------------
+Voting and stacking ensembles built from cached out-of-fold predictions.
+Covers: one cross-validated pass per base model producing out-of-fold (OOF) and test-set
+predictions, memoised in a ``StepCache`` keyed by (estimator params, data, folds), and
+combiners (weighted mean voting, ridge stacking, rank averaging) fitted on the cached
+prediction matrix, so trying another combination costs milliseconds instead of refits.
+
+All base models share the same folds, so the mean of their OOF columns equals what
+``cross_val_predict(VotingRegressor(...))`` would produce with those folds.
+"""
+
+import itertools
+import time
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, RegressorMixin, clone, is_classifier
+from sklearn.linear_model import RidgeCV
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold, StratifiedKFold, cross_val_predict
+
+from data_science.pipeline_cache import StepCache
+
+# Shared across calls: a base model already evaluated on the same data and folds is not refitted
+oof_cache = StepCache(max_entries=64)
+
+
+# 1. OUT-OF-FOLD PREDICTIONS
+
+def make_folds(y, cv: int = 5, classification: bool = False, random_state: int = 0) -> list:
+    """Shuffled (stratified for classification) ``(train, test)`` index pairs shared by every model."""
+    splitter = (StratifiedKFold if classification else KFold)(n_splits=cv, shuffle=True, random_state=random_state)
+    return [(train, test) for train, test in splitter.split(np.zeros(len(y)), y)]
+
+
+def _predict(model, X) -> np.ndarray:
+    """Positive-class probability for binary classifiers, ``predict`` otherwise."""
+    if is_classifier(model) and hasattr(model, 'predict_proba') and len(model.classes_) == 2:
+        return model.predict_proba(X)[:, 1]
+    return np.asarray(model.predict(X), dtype=np.float64)
+
+
+def _take(X, rows):
+    return X.iloc[rows] if hasattr(X, 'iloc') else X[rows]
+
+
+def _out_of_fold(estimator, X, y, folds, X_test=None) -> tuple:
+    """``(oof, test_predictions, seconds)`` for one base model; test predictions come from a full refit."""
+    start = time.perf_counter()
+    y = np.asarray(y)
+    oof = np.empty(len(y))
+    for train, test in folds:
+        model = clone(estimator).fit(_take(X, train), y[train])
+        oof[test] = _predict(model, _take(X, test))
+    test_pred = None
+    if X_test is not None:
+        test_pred = _predict(clone(estimator).fit(X, y), X_test)
+    return oof, test_pred, time.perf_counter() - start
+
+
+class OOFPredictions:
+    """Out-of-fold (and optional test) prediction matrices, one column per base model."""
+
+    def __init__(self, names: list, oof: np.ndarray, y, folds: list, test: Optional[np.ndarray] = None,
+                 fit_seconds: Optional[dict] = None):
+        self.names = list(names)
+        self.oof = oof
+        self.y = np.asarray(y)
+        self.folds = folds
+        self.test = test
+        self.fit_seconds = fit_seconds or {}
+
+    def columns(self, names) -> list:
+        return [self.names.index(name) for name in names]
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.oof, columns=self.names)
+
+
+def compute_oof(estimators: list, X, y, X_test=None, cv: int = 5, folds: Optional[list] = None,
+                random_state: int = 0, cache: Optional[StepCache] = oof_cache) -> OOFPredictions:
+    """Cross-validated predictions for each ``(name, estimator)`` pair, computed once per model.
+
+    ``cache`` is a :class:`StepCache` (the module-level ``oof_cache`` by default); calling again
+    with one extra estimator only fits the new one. Pass ``None`` to always refit.
+    """
+    if folds is None:
+        folds = make_folds(y, cv, classification=is_classifier(estimators[0][1]), random_state=random_state)
+    run = _out_of_fold if cache is None else cache.cache(_out_of_fold)
+    columns, tests, seconds = [], [], {}
+    for name, estimator in estimators:
+        oof, test_pred, elapsed = run(estimator, X, y, folds, X_test)
+        columns.append(oof)
+        tests.append(test_pred)
+        seconds[name] = elapsed
+    test = np.column_stack(tests) if X_test is not None else None
+    return OOFPredictions([name for name, _ in estimators], np.column_stack(columns), y, folds, test, seconds)
+
+
+# 2. COMBINERS
+
+class MeanCombiner(RegressorMixin, BaseEstimator):
+    """Voting: (weighted) mean of the base predictions."""
+
+    def __init__(self, weights=None):
+        self.weights = weights
+
+    def fit(self, P, y=None) -> 'MeanCombiner':
+        P = np.asarray(P)
+        weights = np.ones(P.shape[1]) if self.weights is None else np.asarray(self.weights, dtype=np.float64)
+        self.weights_ = weights / weights.sum()
+        return self
+
+    def predict(self, P) -> np.ndarray:
+        return np.asarray(P) @ self.weights_
+
+
+class RidgeStacker(RegressorMixin, BaseEstimator):
+    """Stacking: a ridge regression over the base predictions, alpha chosen by efficient LOO."""
+
+    def __init__(self, alphas=(0.01, 0.1, 1.0, 10.0, 100.0)):
+        self.alphas = alphas
+
+    def fit(self, P, y) -> 'RidgeStacker':
+        self.model_ = RidgeCV(alphas=self.alphas).fit(np.asarray(P), y)
+        self.coef_, self.intercept_ = self.model_.coef_, self.model_.intercept_
+        return self
+
+    def predict(self, P) -> np.ndarray:
+        return self.model_.predict(np.asarray(P))
+
+
+class RankAverager(RegressorMixin, BaseEstimator):
+    """Rank averaging: mean percentile of each base prediction, mapped back onto the blended scale.
+
+    Percentiles are taken against each model's fitted OOF distribution, so models with
+    different scales or calibration contribute equally.
+    """
+
+    def fit(self, P, y=None) -> 'RankAverager':
+        P = np.asarray(P)
+        self.reference_ = np.sort(P, axis=0)
+        self.target_ = np.sort(P.mean(axis=1))
+        return self
+
+    def predict(self, P) -> np.ndarray:
+        P = np.asarray(P)
+        n = len(self.reference_)
+        pct = np.empty(P.shape)
+        for j in range(P.shape[1]):
+            ref = self.reference_[:, j]
+            # mid-rank so ties sit in the middle of their run
+            pct[:, j] = (np.searchsorted(ref, P[:, j], 'left') + np.searchsorted(ref, P[:, j], 'right')) / (2 * n)
+        return np.interp(pct.mean(axis=1), np.linspace(0, 1, n), self.target_)
+
+
+DEFAULT_COMBINERS = {'mean': MeanCombiner(), 'ridge_stack': RidgeStacker(), 'rank_average': RankAverager()}
+
+
+# 3. COMBINATION SEARCH
+
+def evaluate_combinations(oof: OOFPredictions, combiners: Optional[dict] = None, subsets: Optional[list] = None,
+                          scorer: Callable = r2_score, y_test=None) -> pd.DataFrame:
+    """Score every (subset of base models, combiner) on the cached predictions.
+
+    ``cv_score`` refits the combiner across the same folds over the OOF matrix, so it is not
+    inflated by fitting and scoring on the same rows; ``test_score`` uses the full-refit test
+    predictions when ``y_test`` is given. ``subsets`` defaults to every non-empty subset.
+    """
+    combiners = combiners or DEFAULT_COMBINERS
+    if subsets is None:
+        subsets = [c for r in range(1, len(oof.names) + 1) for c in itertools.combinations(oof.names, r)]
+    rows = []
+    for subset in subsets:
+        cols = oof.columns(subset)
+        P = oof.oof[:, cols]
+        for name, combiner in combiners.items():
+            start = time.perf_counter()
+            nested = cross_val_predict(clone(combiner), P, oof.y, cv=oof.folds)
+            row = {'models': '+'.join(subset), 'combiner': name, 'n_models': len(subset),
+                   'cv_score': scorer(oof.y, nested)}
+            if y_test is not None and oof.test is not None:
+                fitted = clone(combiner).fit(P, oof.y)
+                row['test_score'] = scorer(y_test, fitted.predict(oof.test[:, cols]))
+            row['combine_ms'] = (time.perf_counter() - start) * 1000
+            rows.append(row)
+    return pd.DataFrame(rows).sort_values('cv_score', ascending=False).reset_index(drop=True)
+
+
+def benchmark_ensembling(estimators: list, X, y, cv: int = 5, random_state: int = 0) -> dict:
+    """Refitting a ``VotingRegressor`` per model subset vs one OOF pass plus cached combiners."""
+    from sklearn.ensemble import VotingRegressor
+
+    folds = make_folds(y, cv, random_state=random_state)
+    subsets = [c for r in range(1, len(estimators) + 1) for c in itertools.combinations(range(len(estimators)), r)]
+    start = time.perf_counter()
+    refit = {}
+    for subset in subsets:
+        voter = VotingRegressor([estimators[i] for i in subset])
+        refit[subset] = cross_val_predict(voter, X, y, cv=folds)
+    refit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    oof = compute_oof(estimators, X, y, folds=folds, cache=None)
+    oof_s = time.perf_counter() - start
+    start = time.perf_counter()
+    voting = {subset: oof.oof[:, list(subset)].mean(axis=1) for subset in subsets}
+    combine_s = time.perf_counter() - start
+    return {
+        'subsets': len(subsets),
+        'refit_s': refit_s,
+        'oof_s': oof_s,
+        'combine_s': combine_s,
+        'speedup': refit_s / (oof_s + combine_s),
+        'max_abs_diff': float(max(np.abs(refit[s] - voting[s]).max() for s in subsets)),
+    }
+
+
+if __name__ == "__main__":
+    from sklearn.datasets import load_diabetes
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.linear_model import Ridge
+    from sklearn.model_selection import train_test_split
+
+    print("--- Cached Out-of-Fold Ensembling ---")
+    X, y = load_diabetes(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    estimators = [('rf', RandomForestRegressor(n_estimators=100, random_state=42)),
+                  ('gb', GradientBoostingRegressor(n_estimators=100, random_state=42)),
+                  ('ridge', Ridge(alpha=1.0))]
+    oof = compute_oof(estimators, X_train, y_train, X_test=X_test)
+    print('Base model seconds:', {name: round(s, 2) for name, s in oof.fit_seconds.items()})
+    print(evaluate_combinations(oof, y_test=y_test).round(4).to_string())
+    print(benchmark_ensembling(estimators, X_train, y_train))
@@ -0,0 +1,89 @@
+"""
+lazy_imports.py
+---------------
+Deferred imports for heavy optional libraries (matplotlib, seaborn, plotly).
+Covers: a module proxy that performs the real import on first attribute access, so
+``import data_science.data_visualization`` costs nothing for backends a caller never uses,
+and an ``-X importtime`` harness that measures cold-start import cost in a fresh interpreter.
+
+Usage in a module::
+
+    plt = lazy_import('matplotlib.pyplot')   # nothing imported yet
+    plt.plot(...)                            # matplotlib.pyplot imported here, once
+"""
+
+import importlib
+import os
+import subprocess
+import sys
+import types
+
+PLOTTING_MODULES = ('matplotlib', 'seaborn', 'plotly')
+
+
+# 1. LAZY MODULE PROXY
+
+class LazyModule(types.ModuleType):
+    """Stand-in for a module that imports it on first attribute access and then delegates."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = self.__dict__['_lazy_module'] = importlib.import_module(self.__name__)
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_lazy_module'] is not None else 'not loaded'
+        return '<lazy module {!r} ({})>'.format(self.__name__, state)
+
+
+def lazy_import(name: str):
+    """The module itself if it is already imported, else a :class:`LazyModule` proxy."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+# 2. IMPORT-TIME MEASUREMENT
+
+def import_times(module: str, python: str = sys.executable, cwd: str = None) -> dict:
+    """Cumulative import time in microseconds of every module loaded by ``import <module>``.
+
+    Runs a fresh interpreter with ``-X importtime`` so caches in this process do not hide
+    the cold-start cost.
+    """
+    root = cwd or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([python, '-X', 'importtime', '-c', 'import {}'.format(module)], cwd=root,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def import_report(modules, python: str = sys.executable) -> list:
+    """``(module, cold import ms, plotting libraries pulled in)`` for each module."""
+    rows = []
+    for module in modules:
+        times = import_times(module, python)
+        heavy = sorted({name.split('.')[0] for name in times} & set(PLOTTING_MODULES))
+        rows.append((module, times.get(module, 0) / 1000, heavy))
+    return rows
+
+
+if __name__ == "__main__":
+    print("--- Cold-start import times ---")
+    for module, ms, heavy in import_report(['data_science', 'data_science.data_visualization',
+                                            'data_science.matplotlib_intro', 'data_science.seaborn_intro']):
+        print('{:<36} {:>8.1f} ms  plotting libraries loaded: {}'.format(module, ms, ', '.join(heavy) or 'none'))
@@ -2,12 +2,24 @@
 matplotlib_intro.py
 -------------------
 Step-by-step introduction to matplotlib for data science.
-Covers: basic plots, customization, subplots, and saving figures.
+Covers: basic plots, customization, subplots, saving figures, and headless plot specs for batch rendering.
 """
 
-import matplotlib.pyplot as plt
+import os
+import sys
+
 import numpy as np
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_science.lazy_imports import lazy_import
+
+# pyplot is imported on first use
+plt = lazy_import('matplotlib.pyplot')
+
 def basic_line_plot():
     """Create a simple line plot."""
     x = np.linspace(0, 10, 100)
@@ -49,6 +61,21 @@ def save_figure():
     plt.savefig('saved_plot.png')
     plt.close()
 
+def figure_specs():
+    """The examples above as plot specs for ``data_science.figure_renderer.render_batch``."""
+    x = np.linspace(0, 10, 100)
+    wave = np.linspace(0, 2 * np.pi, 100)
+    return [
+        {'name': 'basic_line_plot', 'kind': 'line', 'x': x, 'y': {'sin(x)': np.sin(x)},
+         'title': 'Basic Line Plot', 'xlabel': 'x', 'ylabel': 'sin(x)'},
+        {'name': 'scatter_plot', 'kind': 'scatter', 'x': np.random.rand(50), 'y': np.random.rand(50),
+         'color': 'red', 'alpha': 0.6, 'title': 'Scatter Plot', 'xlabel': 'X', 'ylabel': 'Y'},
+        {'name': 'subplot_example', 'layout': (2, 1), 'panels': [
+            {'kind': 'line', 'x': wave, 'y': np.sin(wave), 'title': 'Sine'},
+            {'kind': 'line', 'x': wave, 'y': np.cos(wave), 'title': 'Cosine'}]},
+        {'name': 'saved_plot', 'kind': 'line', 'x': np.arange(5), 'y': np.arange(5) ** 2, 'title': 'Saved Plot'},
+    ]
+
 if __name__ == "__main__":
     print("--- Matplotlib Intro Examples ---")
     # Uncomment to test
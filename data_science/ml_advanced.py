@@ -5,27 +5,41 @@ Advanced machine learning workflows and techniques in Python.
 Covers: ensemble methods, unsupervised learning, model evaluation, hyperparameter tuning, model persistence, and interpretability.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-from sklearn.datasets import load_iris
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
-from sklearn.decomposition import PCA
 from sklearn.cluster import KMeans
 from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score, roc_curve
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 
 import joblib
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_science.dataset_registry import get_arrays, get_split
+from data_science.dim_reduction import FastPCA
+from data_science.evaluation_metrics import bootstrap_ci, evaluate_labels, evaluate_scores
+from data_science.model_store import load_model, save_model
+from data_science.permutation_importance import permutation_importance
+from data_science.pipeline_cache import StepCache
+from data_science.streaming_clustering import StreamingPCAKMeans
+
 # --- DRY HELPERS ---
+# Iris is loaded once per process and the split indices are cached per (test_size, seed)
 def get_iris():
-    X, y = load_iris(return_X_y=True)
+    X, y = get_arrays('iris')
     return X, y
 
 def get_train_test(X=None, y=None, test_size=0.2, random_state=42):
     if X is None or y is None:
-        X, y = get_iris()
+        return get_split('iris', test_size=test_size, random_state=random_state)
     return train_test_split(X, y, test_size=test_size, random_state=random_state)
 
 
@@ -33,13 +47,13 @@ def get_train_test(X=None, y=None, test_size=0.2, random_state=42):
 
 # 1. ENSEMBLE METHODS
 def random_forest_example():
-    X, y = get_iris()
-    X_train, X_test, y_train, y_test = get_train_test(X, y)
+    X_train, X_test, y_train, y_test = get_train_test()
     clf = RandomForestClassifier(n_estimators=100, random_state=42)
     clf.fit(X_train, y_train)
     preds = clf.predict(X_test)
-    print('Random Forest Classification Report:\n', classification_report(y_test, preds))
-    print('Confusion Matrix:\n', confusion_matrix(y_test, preds))
+    report = evaluate_labels(y_test, preds)  # report and matrix from one bincount
+    print('Random Forest Classification Report:\n', report['report'].round(2))
+    print('Confusion Matrix:\n', report['confusion_matrix'])
 
 # 2. UNSUPERVISED LEARNING
 
@@ -52,12 +66,15 @@ def pca_kmeans_example():
         X = X.values
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
-    pca = PCA(n_components=2)
+    pca = FastPCA(n_components=2)  # picks full/covariance/randomised SVD by shape; fit cached per input
     X_pca = pca.fit_transform(X_scaled)
     kmeans = KMeans(n_clusters=3, random_state=42)
     clusters = kmeans.fit_predict(X_pca)
     print('PCA shape:', X_pca.shape)
     print('KMeans cluster counts:', np.bincount(clusters))
+    # Streaming path for data too large for memory: chunked scaler -> IncrementalPCA -> MiniBatchKMeans
+    stream = StreamingPCAKMeans(n_components=2, n_clusters=3, chunk_size=50, random_state=42).fit(np.asarray(X))
+    print('Streaming KMeans cluster counts:', np.bincount(stream.predict(X), minlength=3))
 
 # 3. MODEL EVALUATION
 
@@ -70,21 +87,23 @@ def cross_val_and_roc():
     print('CV scores:', scores)
     clf.fit(X_train, y_train)
     proba = clf.predict_proba(X_test)[:, 1]
-    auc = roc_auc_score(y_test, proba)
-    print('ROC AUC:', auc)
-    fpr, tpr, _ = roc_curve(y_test, proba)
-    print('ROC curve FPR:', fpr)
-    print('ROC curve TPR:', tpr)
+    # One sort of the scores gives the AUC, the ROC curve and the confusion matrix
+    report = evaluate_scores(y_test, proba)
+    print('ROC AUC:', report['roc_auc'])
+    print('ROC curve FPR:', report['fpr'])
+    print('ROC curve TPR:', report['tpr'])
+    print('Bootstrap 95% CI:\n', bootstrap_ci(y_test, y_score=proba, metrics=['roc_auc'], n_boot=1000).round(4))
 
 # 4. HYPERPARAMETER TUNING
 
 def grid_search_example():
-    X, y = get_iris()
-    X_train, X_test, y_train, y_test = get_train_test(X, y)
+    X_train, X_test, y_train, y_test = get_train_test()
+    # The scaler is fitted once per fold and shared by every rf__* candidate
+    step_cache = StepCache()
     pipe = Pipeline([
         ('scaler', StandardScaler()),
         ('rf', RandomForestClassifier(random_state=42))
-    ])
+    ], memory=step_cache)
     param_grid = {
         'rf__n_estimators': [50, 100],
         'rf__max_depth': [2, 4, 6]
@@ -93,30 +112,34 @@ def grid_search_example():
     grid.fit(X_train, y_train)
     print('Best params:', grid.best_params_)
     print('Best score:', grid.best_score_)
+    print('Step cache:', step_cache)
 
 # 5. MODEL PERSISTENCE
 
 def save_and_load_model():
-    X, y = get_iris()
-    X_train, X_test, y_train, y_test = get_train_test(X, y)
+    X_train, X_test, y_train, y_test = get_train_test()
     clf = RandomForestClassifier(n_estimators=10, random_state=42)
     clf.fit(X_train, y_train)
     joblib.dump(clf, 'rf_model.joblib')
-    loaded = joblib.load('rf_model.joblib')
-    print('Loaded model accuracy:', loaded.score(X_test, y_test))
+    # Flat array store: memory-mapped on load instead of unpickled
+    save_model(clf, 'rf_model_store')
+    loaded = load_model('rf_model_store')
+    print('Loaded model accuracy:', np.mean(loaded.predict(X_test) == y_test))
 
 # 6. MODEL INTERPRETABILITY (Feature Importances)
 
 def feature_importance_example():
-    X, y = get_iris()
+    X_train, X_test, y_train, y_test = get_train_test()
     clf = RandomForestClassifier(n_estimators=100, random_state=42)
-    clf.fit(X, y)
+    clf.fit(X_train, y_train)
     importances = clf.feature_importances_
-    if isinstance(X, pd.DataFrame):
-        feature_names = X.columns
+    if isinstance(X_train, pd.DataFrame):
+        feature_names = X_train.columns
     else:
-        feature_names = [f"feature_{i}" for i in range(X.shape[1])]
+        feature_names = [f"feature_{i}" for i in range(X_train.shape[1])]
     print('Feature importances:', dict(zip(feature_names, importances)))
+    # Impurity importances are biased; the held-out score drop per shuffled feature is not
+    print('Permutation importances:\n', permutation_importance(clf, X_test, y_test, n_repeats=10).round(4))
 
 if __name__ == "__main__":
     print("--- Advanced ML Examples ---")
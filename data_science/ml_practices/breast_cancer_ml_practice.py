@@ -5,34 +5,39 @@ Comprehensive ML workflow using the Breast Cancer dataset.
 Covers: data exploration, preprocessing, classification, hyperparameter tuning, model persistence, and feature importance.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-from sklearn.datasets import load_breast_cancer
 from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
-from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import GridSearchCV, cross_val_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 import joblib
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from data_science.dataset_registry import get_frame, get_split
+from data_science.evaluation_metrics import evaluate_labels
+
 def get_breast_cancer():
-    data = load_breast_cancer(as_frame=True)
-    X = data.data
-    y = data.target
-    return X, y
+    return get_frame('breast_cancer')
 
 def cancer_gradient_boosting():
-    X, y = get_breast_cancer()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('breast_cancer', test_size=0.2, random_state=42, as_frame=True)
     clf = GradientBoostingClassifier(n_estimators=100, random_state=42)
     clf.fit(X_train, y_train)
     preds = clf.predict(X_test)
-    print('Gradient Boosting Classification Report:\n', classification_report(y_test, preds))
-    print('Confusion Matrix:\n', confusion_matrix(y_test, preds))
+    report = evaluate_labels(y_test, preds)  # report and matrix from one bincount
+    print('Gradient Boosting Classification Report:\n', report['report'].round(2))
+    print('Confusion Matrix:\n', report['confusion_matrix'])
 
 def cancer_grid_search():
-    X, y = get_breast_cancer()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('breast_cancer', test_size=0.2, random_state=42, as_frame=True)
     pipe = Pipeline([
         ('scaler', StandardScaler()),
         ('gb', GradientBoostingClassifier(random_state=42))
@@ -47,8 +52,7 @@ def cancer_grid_search():
     print('Best score:', grid.best_score_)
 
 def cancer_save_and_load():
-    X, y = get_breast_cancer()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('breast_cancer', test_size=0.2, random_state=42, as_frame=True)
     clf = GradientBoostingClassifier(n_estimators=10, random_state=42)
     clf.fit(X_train, y_train)
     joblib.dump(clf, 'cancer_gb_model.joblib')
@@ -110,28 +110,34 @@ Comprehensive ML workflow using the Diabetes dataset.
 Covers: data exploration, preprocessing, regression with multiple models, wide hyperparameter tuning, polynomial features, model persistence, and feature importance.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-from sklearn.datasets import load_diabetes
 from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
+from sklearn.model_selection import GridSearchCV, cross_val_score
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler, PolynomialFeatures
 from sklearn.pipeline import Pipeline
 import joblib
 
 try:
-    from xgboost import XGBRegressor
-    xgb_installed = True
-except ImportError:
-    xgb_installed = False
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from data_science.boosting import BoostedRegressor, resolve_backend
+from data_science.dataset_registry import get_frame, get_split
+from data_science.model_comparison import compare_models, prepare_split
+from data_science.model_store import load_model, save_model
+from data_science.online_learning import benchmark_updates, default_regressors
+from data_science.permutation_importance import permutation_importance
+from data_science.pipeline_cache import StepCache
 
 def get_diabetes():
-    data = load_diabetes(as_frame=True)
-    X = data.data
-    y = data.target
-    return X, y
+    return get_frame('diabetes')
 
 def evaluate_model(model, X_train, X_test, y_train, y_test, name="Model"):
     model.fit(X_train, y_train)
@@ -142,36 +148,23 @@ def evaluate_model(model, X_train, X_test, y_train, y_test, name="Model"):
 
 def diabetes_all_models():
     X, y = get_diabetes()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    scaler = StandardScaler()
-    X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
-
-    print("\n--- Linear Regression ---")
-    evaluate_model(LinearRegression(), X_train_scaled, X_test_scaled, y_train, y_test, "Linear Regression")
-
-    print("\n--- Ridge Regression ---")
-    evaluate_model(Ridge(alpha=1.0), X_train_scaled, X_test_scaled, y_train, y_test, "Ridge Regression")
-
-    print("\n--- Lasso Regression ---")
-    evaluate_model(Lasso(alpha=0.1), X_train_scaled, X_test_scaled, y_train, y_test, "Lasso Regression")
-
-    print("\n--- Random Forest Regressor ---")
-    evaluate_model(RandomForestRegressor(n_estimators=100, random_state=42), X_train, X_test, y_train, y_test, "Random Forest")
-
-    print("\n--- Gradient Boosting Regressor ---")
-    evaluate_model(GradientBoostingRegressor(n_estimators=100, random_state=42), X_train, X_test, y_train, y_test, "Gradient Boosting")
-
-    if xgb_installed:
-        print("\n--- XGBoost Regressor ---")
-        evaluate_model(XGBRegressor(n_estimators=100, random_state=42, verbosity=0), X_train, X_test, y_train, y_test, "XGBoost")
-    else:
-        print("\n--- XGBoost Regressor ---")
-        print("XGBoost is not installed. Skipping XGBoost evaluation.")
+    # Split and scale once; all candidates train concurrently on shared-memory copies
+    data = prepare_split(X, y, test_size=0.2, random_state=42)
+    candidates = [
+        ("Linear Regression", LinearRegression(), True),
+        ("Ridge Regression", Ridge(alpha=1.0), True),
+        ("Lasso Regression", Lasso(alpha=0.1), True),
+        ("Random Forest", RandomForestRegressor(n_estimators=100, random_state=42), False),
+        ("Gradient Boosting", GradientBoostingRegressor(n_estimators=100, random_state=42), False),
+    ]
+    # xgboost when installed, sklearn's histogram GBM otherwise
+    candidates.append(("Boosted Trees ({})".format(resolve_backend()),
+                       BoostedRegressor(n_estimators=100, random_state=42), False))
+    print("\n--- Model comparison ---")
+    print(compare_models(candidates, data).to_string())
 
 def diabetes_grid_search():
-    X, y = get_diabetes()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('diabetes', test_size=0.2, random_state=42, as_frame=True)
     pipe = Pipeline([
         ('scaler', StandardScaler()),
         ('ridge', Ridge())
@@ -185,35 +178,47 @@ def diabetes_grid_search():
     print('Best score:', grid.best_score_)
 
 def diabetes_poly_features():
-    X, y = get_diabetes()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('diabetes', test_size=0.2, random_state=42, as_frame=True)
+    # PolynomialFeatures and StandardScaler are fitted once per fold and shared by every ridge__alpha candidate
+    step_cache = StepCache()
     pipe = Pipeline([
         ('poly', PolynomialFeatures(degree=2, include_bias=False)),
         ('scaler', StandardScaler()),
-        ('ridge', Ridge(alpha=1.0))
-    ])
-    pipe.fit(X_train, y_train)
-    preds = pipe.predict(X_test)
+        ('ridge', Ridge())
+    ], memory=step_cache)
+    grid = GridSearchCV(pipe, {'ridge__alpha': [0.1, 1.0, 10.0, 100.0]}, cv=5)
+    grid.fit(X_train, y_train)
+    preds = grid.predict(X_test)
     print('\n--- Ridge Regression with Polynomial Features (degree=2) ---')
+    print('Best params:', grid.best_params_)
+    print('Step cache:', step_cache)
     print('Poly Ridge MSE:', mean_squared_error(y_test, preds))
     print('Poly Ridge R2:', r2_score(y_test, preds))
 
 def diabetes_save_and_load():
-    X, y = get_diabetes()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('diabetes', test_size=0.2, random_state=42, as_frame=True)
     reg = GradientBoostingRegressor(n_estimators=100, random_state=42)
     reg.fit(X_train, y_train)
     joblib.dump(reg, 'diabetes_gb_model.joblib')
-    loaded = joblib.load('diabetes_gb_model.joblib')
-    print('Loaded GradientBoostingRegressor R2:', loaded.score(X_test, y_test))
+    save_model(reg, 'diabetes_gb_model_store')
+    loaded = load_model('diabetes_gb_model_store')
+    print('Loaded GradientBoostingRegressor R2:', r2_score(y_test, loaded.predict(X_test)))
 
 def diabetes_feature_importance():
-    X, y = get_diabetes()
+    X_train, X_test, y_train, y_test = get_split('diabetes', test_size=0.2, random_state=42, as_frame=True)
     reg = GradientBoostingRegressor(n_estimators=100, random_state=42)
-    reg.fit(X, y)
+    reg.fit(X_train, y_train)
     importances = reg.feature_importances_
-    feature_names = X.columns
+    feature_names = X_train.columns
     print('Feature importances:', dict(zip(feature_names, importances)))
+    print('Permutation importances:\n', permutation_importance(reg, X_test, y_test, n_repeats=10).round(4))
+
+def diabetes_online_learning():
+    X_train, X_test, y_train, y_test = get_split('diabetes', test_size=0.2, random_state=42, as_frame=True)
+    # Stream the training set in chunks instead of refitting every model on all of it
+    results = benchmark_updates(default_regressors(), X_train, y_train, X_test, y_test, chunk_size=50)
+    print('\n--- Online updates vs full retraining ---')
+    print(results)
 
 if __name__ == "__main__":
     print("--- Diabetes Dataset ML Practice ---")
@@ -221,4 +226,5 @@ if __name__ == "__main__":
     diabetes_grid_search()
     diabetes_poly_features()
     diabetes_save_and_load()
-    diabetes_feature_importance()
\ No newline at end of file
+    diabetes_feature_importance()
+    diabetes_online_learning()
\ No newline at end of file
@@ -2,30 +2,35 @@
 diabetes_xgboost_comparison.py
 ------------------------------
 Compares XGBoost with other regressors on the Diabetes dataset.
+Falls back to scikit-learn's histogram gradient boosting when xgboost is not installed.
 """
 
-import numpy as np
-from sklearn.datasets import load_diabetes
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
-from sklearn.preprocessing import StandardScaler
-from xgboost import XGBRegressor
+import os
+import sys
 
+from sklearn.datasets import load_diabetes
 from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..')))
+
+from data_science.boosting import BoostedRegressor, resolve_backend
+from data_science.model_comparison import compare_models, prepare_split
+
 X, y = load_diabetes(return_X_y=True)
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
+data = prepare_split(X, y, test_size=0.2, random_state=42)
 
 models = [
-    ("XGBoost", XGBRegressor(n_estimators=100, random_state=42, verbosity=0)),
-    ("GradientBoosting", GradientBoostingRegressor(n_estimators=100, random_state=42)),
-    ("RandomForest", RandomForestRegressor(n_estimators=100, random_state=42))
+    ("XGBoost" if resolve_backend() == 'xgboost' else "HistGradientBoosting",
+     BoostedRegressor(n_estimators=100, random_state=42), True),
+    ("GradientBoosting", GradientBoostingRegressor(n_estimators=100, random_state=42), True),
+    ("RandomForest", RandomForestRegressor(n_estimators=100, random_state=42), True)
 ]
 
-for name, model in models:
-    model.fit(X_train_scaled, y_train)
-    preds = model.predict(X_test_scaled)
-    print("{} MSE: {:.2f}, R2: {:.3f}".format(name, mean_squared_error(y_test, preds), r2_score(y_test, preds)))
\ No newline at end of file
+if __name__ == "__main__":
+    results = compare_models(models, data)
+    for name, row in results.iterrows():
+        print("{} MSE: {:.2f}, R2: {:.3f}".format(name, row['mse'], row['r2']))
+    print(results.to_string())
\ No newline at end of file
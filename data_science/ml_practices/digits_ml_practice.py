@@ -5,34 +5,40 @@ Comprehensive ML workflow using the Digits dataset.
 Covers: data exploration, preprocessing, classification, hyperparameter tuning, model persistence, and feature importance.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-from sklearn.datasets import load_digits
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
-from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import GridSearchCV, cross_val_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 import joblib
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from data_science.ann_index import IVFIndex, brute_force_knn, recall_at_k
+from data_science.dataset_registry import get_frame, get_split
+from data_science.evaluation_metrics import evaluate_labels
+
 def get_digits():
-    data = load_digits(as_frame=True)
-    X = data.data
-    y = data.target
-    return X, y
+    return get_frame('digits')
 
 def digits_random_forest():
-    X, y = get_digits()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('digits', test_size=0.2, random_state=42, as_frame=True)
     clf = RandomForestClassifier(n_estimators=100, random_state=42)
     clf.fit(X_train, y_train)
     preds = clf.predict(X_test)
-    print('Random Forest Classification Report:\n', classification_report(y_test, preds))
-    print('Confusion Matrix:\n', confusion_matrix(y_test, preds))
+    report = evaluate_labels(y_test, preds)  # report and matrix from one bincount
+    print('Random Forest Classification Report:\n', report['report'].round(2))
+    print('Confusion Matrix:\n', report['confusion_matrix'])
 
 def digits_grid_search():
-    X, y = get_digits()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('digits', test_size=0.2, random_state=42, as_frame=True)
     pipe = Pipeline([
         ('scaler', StandardScaler()),
         ('rf', RandomForestClassifier(random_state=42))
@@ -47,8 +53,7 @@ def digits_grid_search():
     print('Best score:', grid.best_score_)
 
 def digits_save_and_load():
-    X, y = get_digits()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('digits', test_size=0.2, random_state=42, as_frame=True)
     clf = RandomForestClassifier(n_estimators=10, random_state=42)
     clf.fit(X_train, y_train)
     joblib.dump(clf, 'digits_rf_model.joblib')
@@ -63,9 +68,21 @@ def digits_feature_importance():
     feature_names = X.columns
     print('Feature importances:', dict(zip(feature_names, importances)))
 
+def digits_similarity_search():
+    X_train, X_test, y_train, y_test = get_split('digits', test_size=0.2, random_state=42)
+    # IVF index over the raw pixel vectors; each query scans only its nearest lists
+    index = IVFIndex(n_lists=20, n_probe=3).build(X_train)
+    _, neighbours = index.search(X_test, k=5)
+    _, exact = brute_force_knn(X_train, X_test, k=5)
+    print('ANN recall@5 vs brute force:', recall_at_k(neighbours, exact))
+    votes = np.asarray(y_train)[neighbours]
+    preds = np.array([np.bincount(row).argmax() for row in votes])
+    print('5-NN accuracy from ANN neighbours:', np.mean(preds == np.asarray(y_test)))
+
 if __name__ == "__main__":
     print("--- Digits Dataset ML Practice ---")
     digits_random_forest()
     digits_grid_search()
     digits_save_and_load()
-    digits_feature_importance()
\ No newline at end of file
+    digits_feature_importance()
+    digits_similarity_search()
\ No newline at end of file
@@ -5,34 +5,41 @@ Comprehensive ML workflow using the Wine dataset.
 Covers: data exploration, preprocessing, classification, hyperparameter tuning, model persistence, and feature importance.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
-from sklearn.datasets import load_wine
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split, GridSearchCV, cross_val_score
-from sklearn.metrics import classification_report, confusion_matrix
+from sklearn.model_selection import GridSearchCV, cross_val_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
 import joblib
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from data_science.dataset_registry import get_frame, get_split
+from data_science.evaluation_metrics import evaluate_labels
+from data_science.model_store import load_model, save_model
+from data_science.permutation_importance import permutation_importance
+
 def get_wine():
-    data = load_wine(as_frame=True)
-    X = data.data
-    y = data.target
-    return X, y
+    return get_frame('wine')
 
 def wine_random_forest():
-    X, y = get_wine()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('wine', test_size=0.2, random_state=42, as_frame=True)
     clf = RandomForestClassifier(n_estimators=100, random_state=42)
     clf.fit(X_train, y_train)
     preds = clf.predict(X_test)
-    print('Random Forest Classification Report:\n', classification_report(y_test, preds))
-    print('Confusion Matrix:\n', confusion_matrix(y_test, preds))
+    report = evaluate_labels(y_test, preds)  # report and matrix from one bincount
+    print('Random Forest Classification Report:\n', report['report'].round(2))
+    print('Confusion Matrix:\n', report['confusion_matrix'])
 
 def wine_grid_search():
-    X, y = get_wine()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('wine', test_size=0.2, random_state=42, as_frame=True)
     pipe = Pipeline([
         ('scaler', StandardScaler()),
         ('rf', RandomForestClassifier(random_state=42))
@@ -47,21 +54,22 @@ def wine_grid_search():
     print('Best score:', grid.best_score_)
 
 def wine_save_and_load():
-    X, y = get_wine()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('wine', test_size=0.2, random_state=42, as_frame=True)
     clf = RandomForestClassifier(n_estimators=10, random_state=42)
     clf.fit(X_train, y_train)
     joblib.dump(clf, 'wine_rf_model.joblib')
-    loaded = joblib.load('wine_rf_model.joblib')
-    print('Loaded model accuracy:', loaded.score(X_test, y_test))
+    save_model(clf, 'wine_rf_model_store')
+    loaded = load_model('wine_rf_model_store')
+    print('Loaded model accuracy:', np.mean(loaded.predict(X_test) == y_test))
 
 def wine_feature_importance():
-    X, y = get_wine()
+    X_train, X_test, y_train, y_test = get_split('wine', test_size=0.2, random_state=42, as_frame=True)
     clf = RandomForestClassifier(n_estimators=100, random_state=42)
-    clf.fit(X, y)
+    clf.fit(X_train, y_train)
     importances = clf.feature_importances_
-    feature_names = X.columns
+    feature_names = X_train.columns
     print('Feature importances:', dict(zip(feature_names, importances)))
+    print('Permutation importances:\n', permutation_importance(clf, X_test, y_test, n_repeats=10).round(4))
 
 if __name__ == "__main__":
     print("--- Wine Dataset ML Practice ---")
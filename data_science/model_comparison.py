@@ -0,0 +1,169 @@
+"""
+model_comparison.py
+-------------------
+Multi-model comparison harness with one shared data split.
+Covers: fitting the train/test split and scaler once, publishing the arrays read-only to a
+process pool through ``multiprocessing.shared_memory``, training all candidates concurrently,
+and one results table of metric, fit time, predict time and model size.
+"""
+
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import is_classifier
+from sklearn.metrics import accuracy_score, f1_score, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+
+# 1. ONE SPLIT, ONE SCALER
+
+def prepare_split(X, y, test_size: float = 0.2, random_state: int = 42, stratify: bool = False) -> dict:
+    """Split once and scale once; returns raw and scaled float64 arrays for every candidate."""
+    X, y = np.asarray(X, dtype=np.float64), np.asarray(y)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=random_state, stratify=y if stratify else None)
+    scaler = StandardScaler().fit(X_train)
+    return {
+        'X_train': X_train,
+        'X_test': X_test,
+        'X_train_scaled': scaler.transform(X_train),
+        'X_test_scaled': scaler.transform(X_test),
+        'y_train': y_train,
+        'y_test': y_test,
+    }
+
+
+# 2. SHARED MEMORY
+
+class SharedArrays:
+    """Copy a dict of arrays into shared memory once; workers attach read-only views by name.
+
+    Use as a context manager in the parent process; ``spec`` is small and picklable. Only
+    arrays without Python objects can be shared: an object array (e.g. string labels) holds
+    pointers into the parent's heap, so it raises TypeError and has to be pickled instead.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks = []
+        self.spec = {}
+        for key, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            if array.dtype.hasobject:
+                self.close()
+                raise TypeError('{!r} has dtype {}; only arrays without Python objects can be shared'.format(
+                    key, array.dtype))
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.spec[key] = (block.name, array.shape, array.dtype.str)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Release and unlink every block."""
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def attach_shared(spec: dict) -> tuple:
+    """Attach to published blocks; returns (read-only arrays, handles to close afterwards).
+
+    Pool workers share the parent's resource tracker, so the parent alone unlinks the blocks.
+    """
+    arrays, handles = {}, []
+    for key, (name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[key] = array
+        handles.append(block)
+    return arrays, handles
+
+
+# 3. FIT / SCORE ONE CANDIDATE
+
+def _score(estimator, y_true, y_pred) -> dict:
+    if is_classifier(estimator):
+        return {'accuracy': accuracy_score(y_true, y_pred), 'f1_macro': f1_score(y_true, y_pred, average='macro')}
+    return {'mse': mean_squared_error(y_true, y_pred), 'r2': r2_score(y_true, y_pred)}
+
+
+def evaluate_candidate(name: str, estimator, data: dict, scaled: bool) -> dict:
+    """Fit on the shared split and return one result row."""
+    suffix = '_scaled' if scaled else ''
+    X_train, X_test = data['X_train' + suffix], data['X_test' + suffix]
+    start = time.perf_counter()
+    estimator.fit(X_train, data['y_train'])
+    fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    preds = estimator.predict(X_test)
+    predict_s = time.perf_counter() - start
+    row = {'model': name, 'scaled': scaled}
+    row.update(_score(estimator, data['y_test'], preds))
+    row.update({'fit_s': fit_s, 'predict_s': predict_s, 'size_bytes': len(pickle.dumps(estimator))})
+    return row
+
+
+def _evaluate_shared(name: str, estimator, spec: dict, scaled: bool, pickled: dict) -> dict:
+    data, handles = attach_shared(spec)
+    try:
+        return evaluate_candidate(name, estimator, dict(data, **pickled), scaled)
+    finally:
+        del data
+        for block in handles:
+            block.close()
+
+
+# 4. HARNESS
+
+def compare_models(candidates, data: dict, n_jobs: Optional[int] = None, mp_context=None) -> pd.DataFrame:
+    """Train every candidate concurrently on the same split; returns one table sorted by score.
+
+    ``candidates`` is a list of ``(name, estimator)`` or ``(name, estimator, scaled)`` tuples;
+    ``scaled`` defaults to False. ``n_jobs=1`` runs in-process without shared memory; otherwise
+    numeric arrays are shared and object arrays (e.g. string labels) are pickled to each task.
+    ``mp_context`` (e.g. ``multiprocessing.get_context('spawn')``) picks the worker start method.
+    """
+    jobs = [(c[0], c[1], c[2] if len(c) > 2 else False) for c in candidates]
+    if n_jobs == 1:
+        rows = [evaluate_candidate(name, est, data, scaled) for name, est, scaled in jobs]
+    else:
+        arrays = {key: np.asarray(value) for key, value in data.items()}
+        pickled = {key: value for key, value in arrays.items() if value.dtype.hasobject}
+        shareable = {key: value for key, value in arrays.items() if key not in pickled}
+        with SharedArrays(shareable) as shared, ProcessPoolExecutor(max_workers=n_jobs, mp_context=mp_context) as pool:
+            futures = [pool.submit(_evaluate_shared, name, est, shared.spec, scaled, pickled)
+                       for name, est, scaled in jobs]
+            rows = [future.result() for future in futures]
+    table = pd.DataFrame(rows).set_index('model')
+    return table.sort_values('accuracy' if 'accuracy' in table else 'r2', ascending=False)
+
+
+if __name__ == "__main__":
+    from sklearn.datasets import load_diabetes
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+    print("--- Model Comparison Harness ---")
+    X, y = load_diabetes(return_X_y=True)
+    data = prepare_split(X, y)
+    candidates = [
+        ('Linear Regression', LinearRegression(), True),
+        ('Ridge Regression', Ridge(alpha=1.0), True),
+        ('Lasso Regression', Lasso(alpha=0.1), True),
+        ('Random Forest', RandomForestRegressor(n_estimators=100, random_state=42)),
+        ('Gradient Boosting', GradientBoostingRegressor(n_estimators=100, random_state=42)),
+    ]
+    print(compare_models(candidates, data).to_string())
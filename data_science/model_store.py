@@ -0,0 +1,318 @@
+"""
+model_store.py
+--------------
+Fast, pickle-free persistence for fitted tree ensembles.
+Covers: packing scikit-learn forests and gradient boosting models into flat arrays (feature,
+threshold, children, values) with a JSON manifest, zero-copy memory-mapped loading,
+prediction through scikit-learn's compiled tree routines, and a load-time benchmark
+against joblib.
+
+Layout of a store directory::
+
+    manifest.json      model kind, classes, learning rate, init prediction, versions, array names
+    feature.npy        int32   split feature per node (-2 at leaves)
+    threshold.npy      float64 split threshold per node
+    children.npy       int32   (left, right) child index per node within its tree (-1 at leaves)
+    missing_left.npy   bool    whether NaN goes to the left child
+    value.npy          float64 node values, shape (n_nodes, n_values)
+    roots.npy          int32   first node of each tree
+    tree_output.npy    int32   output column each tree contributes to (boosting)
+
+The arrays are scikit-learn's own node data, so loading is ``np.load(mmap_mode='r')`` per
+array: no copies and no post-processing. Predicting rebuilds scikit-learn ``Tree`` objects
+from them through ``Tree.__setstate__``, a private interface (the one unpickling uses), so a
+store is tied to the scikit-learn version recorded in its manifest. Like ``joblib.load``,
+loading under another version warns with ``InconsistentVersionWarning``.
+"""
+
+import json
+import os
+import threading
+import time
+import warnings
+from typing import Optional
+
+import joblib
+import numpy as np
+import sklearn
+from scipy.special import expit
+from sklearn.dummy import DummyClassifier, DummyRegressor
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    ExtraTreesRegressor,
+    GradientBoostingClassifier,
+    GradientBoostingRegressor,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+from sklearn.exceptions import InconsistentVersionWarning
+from sklearn.tree._tree import NODE_DTYPE, Tree
+from sklearn.utils.extmath import softmax
+
+FORMAT_VERSION = 4
+
+FOREST_CLASSIFIERS = (RandomForestClassifier, ExtraTreesClassifier)
+FOREST_REGRESSORS = (RandomForestRegressor, ExtraTreesRegressor)
+
+
+# 1. PACKING SKLEARN MODELS INTO ARRAYS
+
+def _flatten_trees(trees: list, tree_outputs: list) -> dict:
+    """Concatenate the node arrays of fitted sklearn trees; child indices stay per tree."""
+    offsets = np.cumsum([0] + [tree.tree_.node_count for tree in trees])
+    n_nodes = int(offsets[-1])
+    n_values = trees[0].tree_.value.shape[1] * trees[0].tree_.value.shape[2]
+    arrays = {
+        'feature': np.zeros(n_nodes, dtype=np.int32),
+        'threshold': np.zeros(n_nodes, dtype=np.float64),
+        'children': np.zeros((n_nodes, 2), dtype=np.int32),
+        'missing_left': np.zeros(n_nodes, dtype=bool),
+        'value': np.zeros((n_nodes, n_values), dtype=np.float64),
+        'roots': offsets[:-1].astype(np.int32),
+        'tree_output': np.asarray(tree_outputs, dtype=np.int32),
+    }
+    for tree, start, stop in zip(trees, offsets[:-1], offsets[1:]):
+        t = tree.tree_
+        arrays['feature'][start:stop] = t.feature
+        arrays['threshold'][start:stop] = t.threshold
+        arrays['children'][start:stop, 0] = t.children_left
+        arrays['children'][start:stop, 1] = t.children_right
+        arrays['missing_left'][start:stop] = t.missing_go_to_left.astype(bool)
+        arrays['value'][start:stop] = t.value.reshape(t.node_count, -1)
+    return arrays
+
+
+def _gb_init_raw(model) -> np.ndarray:
+    """Constant raw prediction of the gradient boosting init estimator."""
+    if not (isinstance(model.init_, (DummyRegressor, DummyClassifier)) or model.init_ == 'zero'):
+        raise ValueError('Only the default (constant) init estimator can be stored, got {!r}'.format(model.init_))
+    dummy = np.zeros((1, model.n_features_in_), dtype=np.float32)
+    return model._raw_predict_init(dummy)[0]
+
+
+def _gb_link(model) -> str:
+    """Name of the inverse link that maps raw GB scores to probabilities."""
+    if model.n_trees_per_iteration_ > 1:
+        return 'multinomial'
+    return 'half_logit' if model.loss == 'exponential' else 'logit'
+
+
+def pack_ensemble(model) -> tuple:
+    """Convert a fitted forest or gradient boosting model into (arrays, manifest)."""
+    if isinstance(model, FOREST_CLASSIFIERS + FOREST_REGRESSORS):
+        if model.n_outputs_ != 1:
+            raise ValueError('Multi-output forests are not supported')
+        trees = list(model.estimators_)
+        arrays = _flatten_trees(trees, [0] * len(trees))
+        is_classifier = isinstance(model, FOREST_CLASSIFIERS)
+        manifest = {'kind': 'forest_classifier' if is_classifier else 'forest_regressor'}
+        if is_classifier:
+            manifest['classes'] = model.classes_.tolist()
+    elif isinstance(model, (GradientBoostingClassifier, GradientBoostingRegressor)):
+        n_stages, n_outputs = model.estimators_.shape
+        trees = [model.estimators_[i, k] for i in range(n_stages) for k in range(n_outputs)]
+        arrays = _flatten_trees(trees, [k for _ in range(n_stages) for k in range(n_outputs)])
+        manifest = {
+            'kind': 'gb_classifier' if isinstance(model, GradientBoostingClassifier) else 'gb_regressor',
+            'learning_rate': float(model.learning_rate),
+            'init_raw': _gb_init_raw(model).tolist(),
+        }
+        if isinstance(model, GradientBoostingClassifier):
+            manifest['classes'] = model.classes_.tolist()
+            manifest['link'] = _gb_link(model)
+    else:
+        raise TypeError('Unsupported model type: {}'.format(type(model).__name__))
+    manifest.update({
+        'format_version': FORMAT_VERSION,
+        'estimator': type(model).__name__,
+        'sklearn_version': sklearn.__version__,
+        'n_features': int(model.n_features_in_),
+        'n_trees': len(trees),
+        'n_outputs': int(arrays['tree_output'].max()) + 1,
+        'max_depth': int(max(tree.tree_.max_depth for tree in trees)),
+        'arrays': list(arrays),
+    })
+    return arrays, manifest
+
+
+# 2. SAVE / LOAD
+
+def save_model(model, directory: str) -> str:
+    """Write a fitted tree ensemble as flat ``.npy`` arrays plus ``manifest.json``."""
+    arrays, manifest = pack_ensemble(model)
+    os.makedirs(directory, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(directory, name + '.npy'), np.ascontiguousarray(array))
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+
+def load_model(directory: str, mmap: bool = True) -> 'StoredEnsemble':
+    """Load a store as a :class:`StoredEnsemble`; with ``mmap=True`` arrays are memory-mapped read-only (no copies)."""
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError('Unsupported store format: {}'.format(manifest.get('format_version')))
+    if manifest['sklearn_version'] != sklearn.__version__:
+        warnings.warn(InconsistentVersionWarning(estimator_name=manifest['estimator'],
+                                                 current_sklearn_version=sklearn.__version__,
+                                                 original_sklearn_version=manifest['sklearn_version']))
+    mode = 'r' if mmap else None
+    arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mode)
+              for name in manifest['arrays']}
+    return StoredEnsemble(arrays, manifest)
+
+
+# 3. PREDICTION THROUGH SCIKIT-LEARN TREES
+
+def sklearn_trees(arrays: dict, manifest: dict) -> list:
+    """One ``sklearn.tree._tree.Tree`` per stored tree, rebuilt from the node arrays.
+
+    Sample counts and impurities are not stored, so those node fields are zero; prediction
+    does not read them.
+    """
+    classifier = manifest['kind'] == 'forest_classifier'
+    n_classes = np.array([arrays['value'].shape[1] if classifier else 1], dtype=np.intp)
+    bounds = np.append(arrays['roots'], len(arrays['feature']))
+    trees = []
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        nodes = np.zeros(stop - start, dtype=NODE_DTYPE)
+        nodes['left_child'] = arrays['children'][start:stop, 0]
+        nodes['right_child'] = arrays['children'][start:stop, 1]
+        nodes['feature'] = arrays['feature'][start:stop]
+        nodes['threshold'] = arrays['threshold'][start:stop]
+        nodes['missing_go_to_left'] = arrays['missing_left'][start:stop]
+        tree = Tree(manifest['n_features'], n_classes, 1)
+        tree.__setstate__({'max_depth': manifest['max_depth'], 'node_count': int(stop - start), 'nodes': nodes,
+                           'values': arrays['value'][start:stop].reshape(stop - start, 1, -1)})
+        trees.append(tree)
+    return trees
+
+
+class StoredEnsemble:
+    """A loaded store that predicts with scikit-learn's compiled tree routines.
+
+    Loading only memory-maps the arrays. The first prediction rebuilds a scikit-learn
+    ``Tree`` per stored tree; from then on every tree predicts with ``Tree.predict`` and the
+    outputs are accumulated in the same order and with the same floating point operations
+    as ``model.predict``, so results are bit-identical and throughput matches scikit-learn.
+    """
+
+    def __init__(self, arrays: dict, manifest: dict):
+        self.arrays = arrays
+        self.manifest = manifest
+        self.kind = manifest['kind']
+        self.n_features_in_ = manifest['n_features']
+        if 'classes' in manifest:
+            self.classes_ = np.asarray(manifest['classes'])
+        self._trees = None
+        self._trees_lock = threading.Lock()
+
+    def __repr__(self):
+        return 'StoredEnsemble(estimator={}, n_trees={})'.format(self.manifest['estimator'], self.manifest['n_trees'])
+
+    @property
+    def trees(self) -> list:
+        """The scikit-learn ``Tree`` objects, built on first use."""
+        if self._trees is None:
+            with self._trees_lock:
+                if self._trees is None:
+                    self._trees = sklearn_trees(self.arrays, self.manifest)
+        return self._trees
+
+    def _check_X(self, X) -> np.ndarray:
+        X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))  # the dtype sklearn's trees compare in
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError('X must have shape (n_samples, {})'.format(self.n_features_in_))
+        return X
+
+    def _forest_mean(self, X: np.ndarray) -> np.ndarray:
+        out = np.zeros((X.shape[0], self.arrays['value'].shape[1]), dtype=np.float64)
+        for tree in self.trees:  # same accumulation order as sklearn
+            out += tree.predict(X)
+        out /= len(self.trees)
+        return out
+
+    def decision_function(self, X) -> np.ndarray:
+        """Raw boosting score: init prediction plus the scaled sum of all trees."""
+        if not self.kind.startswith('gb_'):
+            raise AttributeError('decision_function is only available for gradient boosting models')
+        X = self._check_X(X)
+        raw = np.tile(np.asarray(self.manifest['init_raw'], dtype=np.float64), (X.shape[0], 1))
+        learning_rate = self.manifest['learning_rate']
+        for tree, k in zip(self.trees, self.arrays['tree_output']):  # stage by stage, as predict_stages does
+            raw[:, k] += learning_rate * tree.predict(X)[:, 0]
+        return raw.ravel() if raw.shape[1] == 1 else raw
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Class probabilities (classifiers only)."""
+        if self.kind == 'forest_classifier':
+            return self._forest_mean(self._check_X(X))
+        if self.kind == 'gb_classifier':
+            raw = self.decision_function(X)
+            if self.manifest['link'] == 'multinomial':
+                return softmax(raw)
+            proba = np.empty((raw.shape[0], 2), dtype=raw.dtype)
+            proba[:, 1] = expit(2 * raw if self.manifest['link'] == 'half_logit' else raw)
+            proba[:, 0] = 1 - proba[:, 1]
+            return proba
+        raise AttributeError('predict_proba is only available for classifiers')
+
+    def predict(self, X) -> np.ndarray:
+        """Predicted class labels or regression targets."""
+        if self.kind == 'forest_classifier':
+            return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+        if self.kind == 'forest_regressor':
+            return self._forest_mean(self._check_X(X))[:, 0]
+        if self.kind == 'gb_regressor':
+            return self.decision_function(X)
+        raw = self.decision_function(X)
+        encoded = (raw >= 0).astype(int) if raw.ndim == 1 else np.argmax(raw, axis=1)
+        return self.classes_[encoded]
+
+
+# 4. LOAD-TIME BENCHMARK
+
+def benchmark_load(model, directory: str, joblib_path: Optional[str] = None, repeats: int = 5) -> dict:
+    """Compare best-of-``repeats`` load time of the flat store against ``joblib.load``."""
+    joblib_path = joblib_path or os.path.join(directory, 'model.joblib')
+    save_model(model, directory)
+    joblib.dump(model, joblib_path)
+
+    def best_time(load):
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            load()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    joblib_s = best_time(lambda: joblib.load(joblib_path))
+    store_s = best_time(lambda: load_model(directory))
+    store_bytes = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)
+                      if name.endswith('.npy'))
+    results = {
+        'joblib_load_s': joblib_s,
+        'store_load_s': store_s,
+        'speedup': joblib_s / store_s if store_s > 0 else float('inf'),
+        'joblib_bytes': os.path.getsize(joblib_path),
+        'store_bytes': store_bytes,
+    }
+    print('joblib.load: {:.4f}s ({} bytes) | store load: {:.4f}s ({} bytes) | speedup x{:.1f}'.format(
+        joblib_s, results['joblib_bytes'], store_s, store_bytes, results['speedup']))
+    return results
+
+
+if __name__ == "__main__":
+    import tempfile
+    from sklearn.datasets import load_digits
+    from sklearn.ensemble import RandomForestClassifier
+
+    print("--- Flat Model Store ---")
+    X, y = load_digits(return_X_y=True)
+    clf = RandomForestClassifier(n_estimators=300, random_state=42).fit(X, y)
+    with tempfile.TemporaryDirectory() as tmp:
+        benchmark_load(clf, os.path.join(tmp, 'digits_rf_store'))
+        stored = load_model(os.path.join(tmp, 'digits_rf_store'))
+        print(stored, 'matches sklearn:', np.array_equal(stored.predict_proba(X), clf.predict_proba(X)))
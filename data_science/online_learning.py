@@ -0,0 +1,189 @@
+"""
+online_learning.py
+------------------
+Incremental (online) training for the ML practice workflows.
+Covers: chunked data streams, ``partial_fit`` learners with an incrementally fitted scaler,
+warm-started forests and gradient boosting that add trees per chunk, and a benchmark of
+per-chunk update time against retraining from scratch on all data seen so far.
+"""
+
+import time
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone, is_classifier
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    ExtraTreesRegressor,
+    GradientBoostingClassifier,
+    GradientBoostingRegressor,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.metrics import accuracy_score, r2_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+WARM_START_TYPES = (RandomForestClassifier, RandomForestRegressor, ExtraTreesClassifier, ExtraTreesRegressor,
+                    GradientBoostingClassifier, GradientBoostingRegressor)
+
+
+# 1. CHUNKED STREAMS
+
+def iter_chunks(X, y, chunk_size: int) -> Iterator[tuple]:
+    """Yield (X_chunk, y_chunk) pairs in order, simulating newly arriving data."""
+    X, y = np.asarray(X), np.asarray(y)
+    for start in range(0, len(X), chunk_size):
+        yield X[start:start + chunk_size], y[start:start + chunk_size]
+
+
+# 2. INCREMENTAL LEARNERS
+
+class PartialFitLearner:
+    """A ``partial_fit`` estimator behind an incrementally updated StandardScaler.
+
+    ``n_passes`` repeats ``partial_fit`` over each chunk; a single pass is often not enough
+    for SGD models to converge on small chunks.
+    """
+
+    def __init__(self, estimator, scale: bool = True, classes=None, n_passes: int = 1):
+        if not hasattr(estimator, 'partial_fit'):
+            raise TypeError('{} has no partial_fit'.format(type(estimator).__name__))
+        self.estimator = estimator
+        self.scaler = StandardScaler() if scale else None
+        self.classes = classes
+        self.n_passes = n_passes
+        self.n_seen_ = 0
+
+    def update(self, X, y) -> 'PartialFitLearner':
+        """Update the scaler statistics and the model with one chunk."""
+        if self.scaler is not None:
+            X = self.scaler.partial_fit(X).transform(X)
+        for _ in range(self.n_passes):
+            if is_classifier(self.estimator) and not hasattr(self.estimator, 'classes_'):
+                classes = self.classes if self.classes is not None else np.unique(y)
+                self.estimator.partial_fit(X, y, classes=classes)
+            else:
+                self.estimator.partial_fit(X, y)
+        self.n_seen_ += len(X)
+        return self
+
+    def predict(self, X):
+        """Predict with the current model state."""
+        if self.scaler is not None:
+            X = self.scaler.transform(X)
+        return self.estimator.predict(X)
+
+
+class WarmStartEnsemble:
+    """Forest or gradient boosting model that grows ``trees_per_chunk`` new trees per chunk.
+
+    Existing trees are kept; with ``warm_start=True`` scikit-learn only fits the added trees,
+    which for boosting are fitted to the residuals of the current model on the new chunk.
+    Boosting classifiers need every class present in each chunk.
+    """
+
+    def __init__(self, estimator, trees_per_chunk: int = 10):
+        if not isinstance(estimator, WARM_START_TYPES):
+            raise TypeError('{} does not support warm-started tree growth'.format(type(estimator).__name__))
+        self.estimator = estimator.set_params(warm_start=True, n_estimators=0)
+        self.trees_per_chunk = trees_per_chunk
+        self.n_seen_ = 0
+
+    def update(self, X, y) -> 'WarmStartEnsemble':
+        """Fit ``trees_per_chunk`` additional trees on the new chunk."""
+        self.estimator.set_params(n_estimators=self.estimator.n_estimators + self.trees_per_chunk)
+        self.estimator.fit(X, y)
+        self.n_seen_ += len(X)
+        return self
+
+    def predict(self, X):
+        """Predict with all trees grown so far."""
+        return self.estimator.predict(X)
+
+
+def make_online(estimator, trees_per_chunk: int = 10, **kwargs):
+    """Wrap an estimator in the matching incremental learner."""
+    if isinstance(estimator, WARM_START_TYPES):
+        return WarmStartEnsemble(estimator, trees_per_chunk=trees_per_chunk)
+    return PartialFitLearner(estimator, **kwargs)
+
+
+# Boosting on small chunks overfits each chunk; shrinkage and subsampling keep updates stable.
+def default_regressors(random_state: int = 42) -> dict:
+    """Online counterparts of the diabetes regressors."""
+    return {
+        'SGD Regressor': SGDRegressor(random_state=random_state),
+        'Random Forest': RandomForestRegressor(random_state=random_state),
+        'Gradient Boosting': GradientBoostingRegressor(learning_rate=0.05, max_depth=2, subsample=0.8,
+                                                       random_state=random_state),
+    }
+
+
+def default_classifiers(random_state: int = 42) -> dict:
+    """Online counterparts of the classification practice models."""
+    return {
+        'SGD Classifier': SGDClassifier(random_state=random_state),
+        'Random Forest': RandomForestClassifier(random_state=random_state),
+        'Gradient Boosting': GradientBoostingClassifier(learning_rate=0.05, max_depth=2, subsample=0.8,
+                                                        random_state=random_state),
+    }
+
+
+# 3. UPDATE vs RETRAIN BENCHMARK
+
+def benchmark_updates(estimators: dict, X, y, X_test, y_test, chunk_size: int = 50, trees_per_chunk: int = 10,
+                      classes: Optional[np.ndarray] = None, n_passes: int = 5) -> pd.DataFrame:
+    """Stream ``X, y`` in chunks; compare incremental updates with full retraining per chunk.
+
+    For each chunk, the incremental learner is updated with only that chunk, while the
+    baseline clones the estimator and refits it on every row seen so far (the ensemble
+    baseline gets the same total number of trees). Times are summed over all chunks.
+    """
+    X, y, X_test = np.asarray(X), np.asarray(y), np.asarray(X_test)
+    rows = []
+    for name, estimator in estimators.items():
+        learner = make_online(clone(estimator), trees_per_chunk=trees_per_chunk, classes=classes, n_passes=n_passes)
+        update_s = retrain_s = 0.0
+        n_chunks = 0
+        for X_chunk, y_chunk in iter_chunks(X, y, chunk_size):
+            n_chunks += 1
+            start = time.perf_counter()
+            learner.update(X_chunk, y_chunk)
+            update_s += time.perf_counter() - start
+
+            full = _retrain_model(estimator, trees_per_chunk * n_chunks)
+            start = time.perf_counter()
+            full.fit(X[:learner.n_seen_], y[:learner.n_seen_])
+            retrain_s += time.perf_counter() - start
+        score = accuracy_score if is_classifier(estimator) else r2_score
+        rows.append({
+            'model': name,
+            'chunks': n_chunks,
+            'update_s': update_s,
+            'retrain_s': retrain_s,
+            'speedup': retrain_s / update_s if update_s > 0 else float('inf'),
+            'online_score': score(y_test, learner.predict(X_test)),
+            'retrain_score': score(y_test, full.predict(X_test)),
+        })
+    return pd.DataFrame(rows).set_index('model')
+
+
+def _retrain_model(estimator, n_trees: int):
+    """From-scratch baseline: same tree count for ensembles, scaler + model otherwise."""
+    full = clone(estimator)
+    if isinstance(full, WARM_START_TYPES):
+        return full.set_params(n_estimators=n_trees)
+    return make_pipeline(StandardScaler(), full)
+
+
+if __name__ == "__main__":
+    from sklearn.datasets import load_diabetes
+    from sklearn.model_selection import train_test_split
+
+    print("--- Online Learning: update vs retrain ---")
+    X, y = load_diabetes(return_X_y=True)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    print(benchmark_updates(default_regressors(), X_train, y_train, X_test, y_test, chunk_size=50))
@@ -5,9 +5,17 @@ Step-by-step introduction to pandas for data science.
 Covers: Series, DataFrame creation, indexing, selection, aggregation, and basic plotting.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
 def series_basics():
     """Create and inspect a pandas Series."""
     s = pd.Series([10, 20, 30], index=['a', 'b', 'c'])
@@ -32,6 +40,11 @@ def dataframe_basics():
     # Reshaping
     df3 = pd.DataFrame({'A': ['foo', 'foo', 'bar'], 'B': [1, 2, 3]})
     print('Pivot table:', df3.pivot_table(index='A', values='B', aggfunc='sum'))
+    # Repeated pivots over the same keys: group once, then aggregate many times;
+    # see data_science.pivot_engine
+    from data_science.pivot_engine import PivotCache
+    pivots = PivotCache(df3, index='A')
+    print('Cached pivots (sum, max):', pivots.pivot('B', 'sum'), pivots.pivot('B', 'max'), sep='\n')
 
 def selection_and_filtering():
     """Select/filter rows and columns."""
@@ -43,6 +56,10 @@ def selection_and_filtering():
     df_right = pd.DataFrame({'key': ['a', 'b', 'd'], 'val2': [4, 5, 6]})
     merged = pd.merge(df_left, df_right, on='key', how='outer')
     print('Merged DataFrame:\n', merged)
+    # The same join streamed in chunks against a hash index of the smaller (right) frame;
+    # see data_science.hash_join for joins too large for a single pd.merge
+    from data_science.hash_join import join_frames
+    print('Hash-joined DataFrame:\n', join_frames(df_left, df_right, on='key', how='outer', chunk_size=2))
 
 def aggregation_and_plot():
     """Aggregate and plot data."""
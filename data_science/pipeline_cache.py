@@ -0,0 +1,215 @@
+"""
+pipeline_cache.py
+-----------------
+Memoisation of fitted scikit-learn Pipeline steps.
+Covers: input fingerprinting, a bounded in-memory LRU store, an optional bounded on-disk store,
+and a joblib.Memory-compatible ``cache`` interface that plugs into ``Pipeline(memory=...)``.
+
+During a grid search every candidate re-fits the upstream transformers on the same fold.
+Because the cache key is (step params, input fingerprint), identical transformers fitted on
+identical data run once per fold instead of once per candidate.
+"""
+
+import functools
+import inspect
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+import joblib
+import numpy as np
+from sklearn.pipeline import Pipeline
+
+
+def fingerprint(obj: Any) -> str:
+    """Return a content hash of an array, DataFrame, estimator or plain Python object."""
+    return joblib.hash(obj)
+
+
+def _code_key(code) -> tuple:
+    """Bytecode, constants and names of a code object, with nested code objects (lambdas) expanded."""
+    consts = tuple(_code_key(const) if inspect.iscode(const) else const for const in code.co_consts)
+    return code.co_code, consts, code.co_names
+
+
+def _function_key(func: Callable, _seen: Optional[set] = None) -> tuple:
+    """What ``func`` computes: its name, code (as ``joblib.Memory`` hashes it) and closure values.
+
+    ``__qualname__`` alone is shared by every lambda in a scope and by each function a factory
+    returns, so it cannot tell them apart. Closure values that cannot be hashed are keyed by identity.
+    """
+    seen = set() if _seen is None else _seen
+    name = (getattr(func, '__module__', None), getattr(func, '__qualname__', type(func).__qualname__))
+    code = getattr(func, '__code__', None)
+    if code is None or id(func) in seen:  # builtins, callables, or a nested function calling itself
+        return name
+    seen.add(id(func))
+    cells = []
+    for cell in func.__closure__ or ():
+        value = cell.cell_contents
+        if inspect.isfunction(value):
+            cells.append(_function_key(value, seen))
+            continue
+        try:
+            cells.append(fingerprint(value))
+        except Exception:
+            cells.append((type(value).__qualname__, id(value)))
+    return name + (_code_key(code), tuple(cells))
+
+
+def _nbytes(obj: Any) -> int:
+    """Rough size in bytes of a cached value (arrays and frames dominate)."""
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if hasattr(obj, 'memory_usage'):
+        return int(np.sum(obj.memory_usage(deep=True)))
+    if isinstance(obj, (tuple, list)):
+        return sum(_nbytes(item) for item in obj)
+    if hasattr(obj, 'data') and hasattr(obj.data, 'nbytes'):  # scipy.sparse
+        return obj.data.nbytes
+    return 0
+
+
+class StepCache:
+    """Bounded memo store with the ``joblib.Memory.cache`` interface.
+
+    Pass an instance as ``Pipeline(memory=StepCache())``. Entries live in an in-memory LRU
+    bounded by ``max_entries`` and ``max_bytes``; when ``location`` is given, entries are also
+    written to disk and the directory is trimmed to ``max_disk_bytes``.
+
+    The instance is shared (not copied) when ``GridSearchCV`` clones the pipeline, so all
+    candidates hit the same store. Cached outputs are returned as-is, so downstream steps
+    must not modify their input in place (no scikit-learn estimator does).
+    """
+
+    def __init__(self, location: Optional[str] = None, max_entries: int = 32,
+                 max_bytes: int = 512 * 1024 ** 2, max_disk_bytes: int = 2 * 1024 ** 3):
+        self.location = location
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        if location is not None:
+            os.makedirs(location, exist_ok=True)
+
+    # GridSearchCV/clone deep-copy non-estimator params; keep one shared store instead.
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __getstate__(self):
+        # Worker processes only get the configuration (and the shared disk store).
+        state = self.__dict__.copy()
+        state['_entries'] = OrderedDict()
+        state['_sizes'] = {}
+        return state
+
+    def __repr__(self):
+        return 'StepCache(location={!r}, entries={}, hits={}, misses={})'.format(
+            self.location, len(self._entries), self.hits, self.misses)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def cache(self, func: Callable, ignore: Optional[list] = None, **kwargs) -> Callable:
+        """Wrap ``func`` so calls with the same (non-ignored) arguments are computed once."""
+        signature = inspect.signature(func)
+        ignore = set(ignore or [])
+        func_key = _function_key(func)
+
+        @functools.wraps(func)
+        def cached(*args, **kw):
+            bound = signature.bind(*args, **kw)
+            bound.apply_defaults()
+            key_args = {name: value for name, value in bound.arguments.items() if name not in ignore}
+            key = fingerprint((func_key, key_args))
+            found, value = self._get(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            value = func(*args, **kw)
+            self._put(key, value)
+            return value
+
+        return cached
+
+    def clear(self) -> None:
+        """Drop all in-memory and on-disk entries."""
+        self._entries.clear()
+        self._sizes.clear()
+        for path in self._disk_files():
+            os.remove(path)
+
+    # --- storage helpers ---
+    def _get(self, key):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+        if self.location is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                value = joblib.load(path)
+                os.utime(path)  # mark as recently used for disk eviction
+                self._remember(key, value)
+                return True, value
+        return False, None
+
+    def _put(self, key, value):
+        self._remember(key, value)
+        if self.location is not None:
+            joblib.dump(value, self._path(key))
+            self._trim_disk()
+
+    def _remember(self, key, value):
+        size = _nbytes(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._sizes[key] = size
+        while len(self._entries) > self.max_entries or sum(self._sizes.values()) > self.max_bytes:
+            old_key, _ = self._entries.popitem(last=False)
+            del self._sizes[old_key]
+
+    def _path(self, key):
+        return os.path.join(self.location, key + '.joblib')
+
+    def _disk_files(self):
+        if self.location is None:
+            return []
+        return [os.path.join(self.location, name) for name in os.listdir(self.location)
+                if name.endswith('.joblib')]
+
+    def _trim_disk(self):
+        files = sorted(self._disk_files(), key=os.path.getmtime)
+        total = sum(os.path.getsize(path) for path in files)
+        while files and total > self.max_disk_bytes:
+            oldest = files.pop(0)
+            total -= os.path.getsize(oldest)
+            os.remove(oldest)
+
+
+def cached_pipeline(steps: list, cache: Optional[StepCache] = None, **kwargs):
+    """Build a Pipeline whose transformer steps are memoised in ``cache``."""
+    return Pipeline(steps, memory=cache if cache is not None else StepCache(), **kwargs)
+
+
+if __name__ == "__main__":
+    from sklearn.datasets import load_iris
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import GridSearchCV
+    from sklearn.preprocessing import StandardScaler
+
+    print("--- Pipeline Step Cache ---")
+    X, y = load_iris(return_X_y=True)
+    cache = StepCache()
+    pipe = cached_pipeline([('scaler', StandardScaler()), ('rf', RandomForestClassifier(random_state=42))], cache)
+    grid = GridSearchCV(pipe, {'rf__n_estimators': [20, 50], 'rf__max_depth': [2, 4]}, cv=3)
+    grid.fit(X, y)
+    print('Best params:', grid.best_params_)
+    print(cache)
@@ -0,0 +1,162 @@
+"""
+plotly_export.py
+----------------
+Compact, offline Plotly HTML for large scatter data.
+Covers: a density-preserving sampler that thins every region in proportion while keeping one
+point in each occupied grid cell, so outliers survive (crowded regions can optionally be thinned
+harder to flatten the density), WebGL (``Scattergl``) traces with float32 coordinates (binary-encoded
+by Plotly), one trace per colour group, and static HTML export that references a single
+shared ``plotly.min.js`` written next to the files instead of inlining ~4.5 MB per file.
+
+Everything runs offline: the JavaScript bundle ships with the plotly package.
+"""
+
+import os
+import time
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data_science.lazy_imports import lazy_import
+
+go = lazy_import('plotly.graph_objects')
+pio = lazy_import('plotly.io')
+
+
+# 1. DENSITY SAMPLING
+
+def _cell_ids(x: np.ndarray, y: np.ndarray, bins: int) -> np.ndarray:
+    """Flattened index of each point's cell on a ``bins`` x ``bins`` grid over the data range."""
+    ids = np.zeros(len(x), dtype=np.int64)
+    for values in (x, y):
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        scale = bins / (hi - lo) if hi > lo else 0.0
+        cell = np.clip(np.floor((np.nan_to_num(values, nan=lo) - lo) * scale), 0, bins - 1).astype(np.int64)
+        ids = ids * bins + cell
+    return ids
+
+
+def density_sample(x, y, max_points: int, bins: int = 256, alpha: float = 0.0, random_state: int = 0) -> np.ndarray:
+    """Sorted row indices of about ``max_points`` points that keep the data's density and its outliers.
+
+    Every occupied cell of a ``bins`` x ``bins`` grid keeps one random representative, so
+    outliers and sparse regions always survive. A cell holding ``c`` points keeps
+    ``clip(lam * c ** (1 - alpha), 1, c)`` of them in expectation (its representative included),
+    with ``lam`` chosen so the expected sample size is ``max_points``. The default ``alpha=0``
+    thins every cell by the same factor, so relative density is preserved apart from the
+    one-point floor; ``alpha > 0`` opts in to thinning crowded cells harder, and ``alpha=1``
+    evens cells out. If there are more occupied cells than ``max_points``, a random subset of
+    the representatives is returned.
+    """
+    x, y = np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64)
+    if len(x) <= max_points:
+        return np.arange(len(x))
+    rng = np.random.default_rng(random_state)
+    _, inverse, cell_counts = np.unique(_cell_ids(x, y, bins), return_inverse=True, return_counts=True)
+    order = rng.permutation(len(x))
+    _, first = np.unique(inverse[order], return_index=True)
+    representative = np.zeros(len(x), dtype=bool)
+    representative[order[first]] = True
+    if len(cell_counts) >= max_points:
+        return np.sort(rng.choice(order[first], max_points, replace=False))
+    counts = cell_counts.astype(np.float64)
+    share = counts ** (1.0 - alpha)
+
+    def kept(lam):
+        return np.clip(lam * share, 1.0, counts)
+
+    lo, hi = 0.0, float(np.max(counts / share))  # at hi every point is kept
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if kept(mid).sum() < max_points else (lo, mid)
+    # the representative covers one of each cell's kept points; the others share the rest
+    with np.errstate(invalid='ignore', divide='ignore'):
+        keep_probability = np.where(cell_counts > 1, (kept(lo) - 1) / (counts - 1), 0.0)[inverse]
+    return np.flatnonzero(representative | (rng.random(len(x)) < keep_probability))
+
+
+# 2. FIGURES
+
+def scatter_figure(frame: pd.DataFrame, x: str, y: str, color: Optional[str] = None, max_points: int = 100000,
+                   alpha: float = 0.0, marker_size: int = 3, title: Optional[str] = None,
+                   template: str = 'plotly_white', random_state: int = 0):
+    """WebGL scatter of ``frame[x]`` vs ``frame[y]`` (one trace per ``color`` value) on a density sample."""
+    rows = density_sample(frame[x].to_numpy(), frame[y].to_numpy(), max_points, alpha=alpha,
+                          random_state=random_state)
+    sample = frame.iloc[rows]
+    groups = [(None, sample)] if color is None else sample.groupby(color, observed=True, sort=True)
+    fig = go.Figure()
+    for name, group in groups:
+        fig.add_trace(go.Scattergl(
+            x=group[x].to_numpy(dtype=np.float32), y=group[y].to_numpy(dtype=np.float32), mode='markers',
+            name=None if name is None else str(name), showlegend=name is not None,
+            marker={'size': marker_size, 'opacity': 0.6}))
+    subtitle = '' if len(rows) == len(frame) else ' ({:,} of {:,} points)'.format(len(rows), len(frame))
+    fig.update_layout(title=(title or '{} vs {}'.format(y, x)) + subtitle, xaxis_title=x, yaxis_title=y,
+                      legend_title_text=color, template=template)
+    return fig
+
+
+# 3. EXPORT
+
+def export_html(fig, path: str, include_plotlyjs='directory', full_html: bool = True) -> dict:
+    """Write ``fig`` as static HTML; by default the page loads ``plotly.min.js`` from its directory.
+
+    With ``'directory'`` the bundle is copied next to ``path`` once and reused by every file
+    exported to the same directory.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    start = time.perf_counter()
+    pio.write_html(fig, path, include_plotlyjs=include_plotlyjs, full_html=full_html, auto_open=False,
+                   config={'displaylogo': False})
+    return {'path': path, 'bytes': os.path.getsize(path), 'export_s': time.perf_counter() - start}
+
+
+def export_dashboard(figures: dict, out_dir: str) -> pd.DataFrame:
+    """Export ``{name: figure}`` to ``out_dir/<name>.html`` sharing one ``plotly.min.js``."""
+    rows = []
+    for name, fig in figures.items():
+        row = export_html(fig, os.path.join(out_dir, name + '.html'))
+        row['name'] = name
+        rows.append(row)
+    table = pd.DataFrame(rows).set_index('name')
+    bundle = os.path.join(out_dir, 'plotly.min.js')
+    table.attrs['shared_js_bytes'] = os.path.getsize(bundle) if os.path.exists(bundle) else 0
+    return table
+
+
+def benchmark_export(frame: pd.DataFrame, x: str, y: str, color: Optional[str] = None, out_dir: str = '.',
+                     max_points: int = 100000) -> pd.DataFrame:
+    """HTML size and build+write time: ``px.scatter`` over every row (inlined JS) vs this exporter."""
+    import plotly.express as px
+
+    rows = []
+    start = time.perf_counter()
+    full = px.scatter(frame, x=x, y=y, color=color)
+    path = os.path.join(out_dir, 'px_full.html')
+    full.write_html(path, include_plotlyjs=True)
+    rows.append({'export': 'px.scatter, all rows, inline JS', 'points': len(frame), 'bytes': os.path.getsize(path),
+                 'seconds': time.perf_counter() - start})
+    start = time.perf_counter()
+    fig = scatter_figure(frame, x, y, color=color, max_points=max_points)
+    result = export_html(fig, os.path.join(out_dir, 'compact.html'))
+    rows.append({'export': 'Scattergl, density sample, shared JS', 'points': sum(len(t.x) for t in fig.data),
+                 'bytes': result['bytes'], 'seconds': time.perf_counter() - start})
+    return pd.DataFrame(rows).set_index('export')
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    print("--- Compact Plotly Export ---")
+    rng = np.random.default_rng(0)
+    n = 1000000
+    centres = rng.normal(0, 5, size=(3, 2))
+    label = rng.integers(0, 3, n)
+    frame = pd.DataFrame(centres[label] + rng.standard_normal((n, 2)), columns=['sepal_width', 'sepal_length'])
+    frame['species'] = np.array(['setosa', 'versicolor', 'virginica'])[label]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(benchmark_export(frame, 'sepal_width', 'sepal_length', color='species', out_dir=tmp).round(2))
+        print('Shared plotly.min.js: {:,} bytes, written once per directory'.format(
+            os.path.getsize(os.path.join(tmp, 'plotly.min.js'))))
@@ -0,0 +1,282 @@
+"""
+prediction_server.py
+--------------------
+Local prediction service that keeps the persisted models resident in memory.
+Covers: loading joblib files or flat model stores once, micro-batching concurrent single-row
+requests under a max-latency bound, p50/p99 latency and batch-size metrics, and a stdlib
+``http.server`` JSON API.
+
+Endpoints::
+
+    GET  /models              names and feature counts of the loaded models
+    GET  /metrics             per-model latency percentiles and batch-size statistics
+    POST /predict/<model>     {"features": [...]} for one row (micro-batched)
+                              {"instances": [[...], ...]} for a client-side batch
+
+Run from the repository root with ``python -m data_science.prediction_server``.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+
+import joblib
+import numpy as np
+
+from data_science.model_store import load_model
+
+DEFAULT_MODELS = {
+    'wine_rf': 'wine_rf_model.joblib',
+    'digits_rf': 'digits_rf_model.joblib',
+    'diabetes_gb': 'diabetes_gb_model.joblib',
+}
+
+
+# 1. MICRO-BATCHING
+
+class MicroBatcher:
+    """Coalesce single-row requests into one ``predict`` call per batch.
+
+    A worker thread waits for the first queued row, then keeps collecting rows until either
+    ``max_batch_size`` rows are queued or ``max_latency_ms`` has passed since the first one
+    arrived. The whole batch is predicted with one call and each caller's Future is resolved.
+    With ``n_features`` set, rows of another width are rejected in :meth:`submit`; otherwise
+    rows are grouped by width, so a malformed row only fails the requests of its own width.
+    """
+
+    def __init__(self, predict_fn: Callable, max_batch_size: int = 64, max_latency_ms: float = 5.0,
+                 metrics_window: int = 10000, n_features: Optional[int] = None):
+        self.predict_fn = predict_fn
+        self.n_features = n_features
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000.0
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=metrics_window)
+        self._batch_sizes = deque(maxlen=metrics_window)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._stopped = threading.Event()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, row) -> Future:
+        """Queue one feature row; the Future resolves to its single prediction.
+
+        Raises ValueError for a row of the wrong width and RuntimeError once :meth:`close` has been called.
+        """
+        row = np.asarray(row, dtype=np.float64).ravel()
+        if self.n_features is not None and len(row) != self.n_features:
+            raise ValueError('expected {} features, got {}'.format(self.n_features, len(row)))
+        future = Future()
+        item = (row, future, time.perf_counter())
+        with self._lock:  # close() cannot slip in between the check and the put
+            if self._stopped.is_set():
+                raise RuntimeError('cannot submit rows after the MicroBatcher is closed')
+            self._queue.put(item)
+        return future
+
+    def predict(self, row, timeout: Optional[float] = None):
+        """Blocking convenience wrapper around :meth:`submit`."""
+        return self.submit(row).result(timeout=timeout)
+
+    def close(self) -> None:
+        """Stop the worker thread after the queued rows are served."""
+        with self._lock:
+            self._stopped.set()
+            self._queue.put(None)
+        self._worker.join()
+
+    def _collect(self) -> list:
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = first[2] + self.max_latency
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # let the outer loop see the stop signal
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stopped.is_set() and self._queue.empty()):
+            by_width = {}
+            for item in self._collect():
+                by_width.setdefault(len(item[0]), []).append(item)
+            for batch in by_width.values():
+                self._predict_batch(batch)
+
+    def _predict_batch(self, batch: list) -> None:
+        rows, futures, started = zip(*batch)
+        try:
+            predictions = self.predict_fn(np.vstack(rows))
+            if len(predictions) != len(futures):
+                raise ValueError('predict_fn returned {} predictions for a batch of {} rows'.format(
+                    len(predictions), len(futures)))
+        except Exception as exc:  # surface model errors to every waiting caller
+            for future in futures:
+                future.set_exception(exc)
+            return
+        done = time.perf_counter()
+        for future, prediction in zip(futures, predictions):
+            future.set_result(prediction)
+        with self._lock:
+            self._requests += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._latencies.extend(done - t for t in started)
+
+    def metrics(self) -> dict:
+        """Latency percentiles (ms) and batch-size statistics over the recent window."""
+        with self._lock:
+            latencies = np.asarray(self._latencies) * 1000.0
+            sizes = np.asarray(self._batch_sizes)
+            requests = self._requests
+        if not len(latencies):
+            return {'requests': 0, 'batches': 0}
+        return {
+            'requests': requests,
+            'batches': int(len(sizes)),
+            'latency_p50_ms': float(np.percentile(latencies, 50)),
+            'latency_p99_ms': float(np.percentile(latencies, 99)),
+            'batch_size_mean': float(sizes.mean()),
+            'batch_size_p50': float(np.percentile(sizes, 50)),
+            'batch_size_max': int(sizes.max()),
+        }
+
+
+# 2. MODEL REGISTRY
+
+def load_any(path: str):
+    """Load a flat model store directory or a joblib file."""
+    if os.path.isdir(path):
+        return load_model(path)
+    return joblib.load(path)
+
+
+class PredictionService:
+    """Resident models, each behind its own :class:`MicroBatcher`."""
+
+    def __init__(self, models: Dict[str, object], **batcher_kwargs):
+        self.models = dict(models)
+        self.batchers = {name: MicroBatcher(model.predict, n_features=getattr(model, 'n_features_in_', None),
+                                            **batcher_kwargs)
+                         for name, model in self.models.items()}
+
+    @classmethod
+    def from_paths(cls, paths: Dict[str, str], **batcher_kwargs) -> 'PredictionService':
+        """Load every path once; models that fail to load are reported and skipped."""
+        models = {}
+        for name, path in paths.items():
+            try:
+                models[name] = load_any(path)
+            except Exception as exc:
+                print('Skipping model {!r} ({}): {}'.format(name, path, exc))
+        return cls(models, **batcher_kwargs)
+
+    def predict_one(self, name: str, row):
+        """Predict one row through the model's micro-batcher."""
+        return self.batchers[name].predict(row)
+
+    def predict_many(self, name: str, rows):
+        """Predict a client-side batch directly."""
+        return self.models[name].predict(np.asarray(rows, dtype=np.float64))
+
+    def describe(self) -> dict:
+        """Type and feature count of each resident model."""
+        return {name: {'type': type(model).__name__, 'n_features': int(model.n_features_in_)}
+                for name, model in self.models.items()}
+
+    def metrics(self) -> dict:
+        """Micro-batching metrics per model."""
+        return {name: batcher.metrics() for name, batcher in self.batchers.items()}
+
+    def close(self) -> None:
+        """Stop all batcher threads."""
+        for batcher in self.batchers.values():
+            batcher.close()
+
+
+# 3. HTTP API
+
+def _to_json(value):
+    """Convert NumPy arrays/scalars into JSON-serialisable Python objects."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def make_handler(service: PredictionService):
+    """Build a request handler class bound to ``service``."""
+
+    class PredictionHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/models':
+                self._send(200, service.describe())
+            elif self.path == '/metrics':
+                self._send(200, service.metrics())
+            else:
+                self._send(404, {'error': 'not found'})
+
+        def do_POST(self):
+            name = self.path.rsplit('/', 1)[-1]
+            if not self.path.startswith('/predict/') or name not in service.models:
+                self._send(404, {'error': 'unknown model {!r}'.format(name)})
+                return
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                if 'instances' in payload:
+                    result = service.predict_many(name, payload['instances'])
+                    self._send(200, {'predictions': _to_json(np.asarray(result))})
+                else:
+                    self._send(200, {'prediction': _to_json(service.predict_one(name, payload['features']))})
+            except (KeyError, ValueError, TypeError) as exc:
+                self._send(400, {'error': str(exc)})
+
+        def log_message(self, format, *args):  # keep the console quiet under load
+            pass
+
+    return PredictionHandler
+
+
+def serve(service: PredictionService, host: str = '127.0.0.1', port: int = 8000) -> ThreadingHTTPServer:
+    """Create the HTTP server (call ``serve_forever`` or run it in a thread)."""
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+if __name__ == "__main__":
+    print("--- Prediction Server ---")
+    service = PredictionService.from_paths(DEFAULT_MODELS, max_batch_size=64, max_latency_ms=5)
+    print('Loaded models:', service.describe())
+    server = serve(service)
+    print('Listening on http://{}:{}'.format(*server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
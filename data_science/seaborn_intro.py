@@ -2,11 +2,22 @@
 seaborn_intro.py
 ----------------
 Step-by-step introduction to seaborn for data science.
-Covers: basic plots, categorical plots, regression plots, and style customization.
+Covers: basic plots, categorical plots, regression plots, style customization, and pre-aggregated plots for large frames.
 """
 
-import seaborn as sns
-import matplotlib.pyplot as plt
+import os
+import sys
+
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_science.lazy_imports import lazy_import
+
+# seaborn and pyplot are imported on first use
+sns = lazy_import('seaborn')
+plt = lazy_import('matplotlib.pyplot')
 
 def basic_scatter():
     """Scatter plot with seaborn."""
@@ -38,7 +49,8 @@ def regression_plot():
     plt.title('Tip vs Total Bill')
     plt.show()
     # Heatmap
-    corr = data.corr(numeric_only=True)
+    from data_science.correlation import correlate
+    corr = correlate(data)  # float32 Gram products; matches data.corr(numeric_only=True)
     sns.heatmap(corr, annot=True, cmap='coolwarm')
     plt.title('Correlation Heatmap')
     plt.show()
@@ -54,6 +66,23 @@ def style_customization():
     print('Boxplot saved as seaborn_intro_boxplot.png')
     plt.show()
 
+def large_frame_plots(data, out_dir, x='class', hue='sex', value='age', chunk_size=1000000):
+    """countplot, FacetGrid histplot and corr() heatmap for large frames.
+
+    The frame (or a callable yielding chunks) is scanned once into counts, bin counts and a
+    correlation matrix; only those aggregates are drawn and written to ``out_dir``.
+    """
+    from data_science.figure_renderer import render_batch
+    from data_science.plot_aggregates import (category_counts, correlation_matrix, correlation_spec, count_spec,
+                                              histogram_counts, histogram_spec)
+    counts = category_counts(data, x, hue=hue, chunk_size=chunk_size)
+    hist = histogram_counts(data, value, by=hue, chunk_size=chunk_size)
+    corr = correlation_matrix(data, chunk_size=chunk_size)
+    specs = [count_spec(counts, '{}_count'.format(x), 'Passenger Class Count' if x == 'class' else None),
+             histogram_spec(hist, '{}_by_{}'.format(value, hue), '{} Distribution by {}'.format(value, hue)),
+             correlation_spec(corr, 'correlation_heatmap')]
+    return render_batch(specs, out_dir, n_jobs=1)
+
 if __name__ == "__main__":
     print("--- Seaborn Intro Examples ---")
     # Uncomment to test
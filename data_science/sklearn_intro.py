@@ -5,20 +5,29 @@ Step-by-step introduction to scikit-learn for data science.
 Covers: datasets, preprocessing, model training, evaluation, and pipelines.
 """
 
-from sklearn.datasets import load_iris
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+import os
+import sys
+
+from sklearn.model_selection import cross_val_score, GridSearchCV
 from sklearn.linear_model import LogisticRegression
-from sklearn.metrics import accuracy_score, classification_report, roc_auc_score
+from sklearn.metrics import accuracy_score
 from sklearn.preprocessing import StandardScaler
 from sklearn.feature_selection import SelectKBest, f_classif
 import joblib
 from sklearn.pipeline import Pipeline
 import pandas as pd
 
+try:
+    import data_science
+except ImportError:  # run by path: put the repository root on sys.path for the data_science imports
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_science.dataset_registry import get_arrays, get_split
+from data_science.evaluation_metrics import bootstrap_ci, evaluate_labels, evaluate_proba
+
 def load_and_split():
     """Load iris dataset and split into train/test."""
-    X, y = load_iris(return_X_y=True, as_frame=True)
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    X_train, X_test, y_train, y_test = get_split('iris', test_size=0.2, random_state=42, as_frame=True)
     print('Train shape:', X_train.shape)
     print('Test shape:', X_test.shape)
     return X_train, X_test, y_train, y_test
@@ -30,11 +39,11 @@ def train_and_evaluate():
     model.fit(X_train, y_train)
     preds = model.predict(X_test)
     print('Accuracy:', accuracy_score(y_test, preds))
-    print('Classification report:\n', classification_report(y_test, preds))
+    print('Classification report:\n', evaluate_labels(y_test, preds)['report'].round(2))
 
 def cross_validation_example():
     """Cross-validation with logistic regression."""
-    X, y = load_iris(return_X_y=True, as_frame=False)
+    X, y = get_arrays('iris')
     model = LogisticRegression(max_iter=200)
     scores = cross_val_score(model, X, y, cv=5)
     print('CV scores:', scores)
@@ -79,8 +88,11 @@ def multiclass_roc_example():
     model = LogisticRegression(max_iter=200)
     model.fit(X_train, y_train)
     proba = model.predict_proba(X_test)
-    auc = roc_auc_score(y_test, proba, multi_class='ovr')
-    print('Multiclass ROC AUC:', auc)
+    report = evaluate_proba(y_test, proba, model.classes_)
+    print('Multiclass ROC AUC:', report['roc_auc'])
+    print('Per-class AUC:', report['roc_auc_per_class'])
+    print('Bootstrap 95% CI:\n', bootstrap_ci(y_test, y_score=proba, y_pred=model.predict(X_test),
+                                             metrics=['roc_auc', 'accuracy'], classes=model.classes_).round(4))
 
 def pipeline_example():
     """Build a pipeline with scaling and logistic regression."""
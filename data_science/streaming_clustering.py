@@ -0,0 +1,213 @@
+"""
+streaming_clustering.py
+-----------------------
+Out-of-core counterpart of ``ml_advanced.pca_kmeans_example``.
+Covers: standardising, ``IncrementalPCA`` and ``MiniBatchKMeans`` fitted chunk by chunk so
+the full matrix never has to be in memory, a NumPy-only assigner (scaler + projection +
+centroids) persisted as ``.npy`` files for fast memory-mapped assignment of new points, and a
+fit-time / inertia benchmark against the in-memory PCA + KMeans pipeline.
+
+``X`` may be an array (including an ``np.memmap``), which is sliced into chunks, or a
+zero-argument callable returning a fresh iterator of chunks, e.g. reading a CSV with
+``pd.read_csv(..., chunksize=...)``. Fitting makes one pass for the scaler, one for PCA and
+``n_epochs`` passes for k-means.
+"""
+
+import json
+import os
+import time
+from typing import Callable, Iterator, Union
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.decomposition import PCA, IncrementalPCA
+from sklearn.metrics import adjusted_rand_score
+from sklearn.preprocessing import StandardScaler
+
+ASSIGNER_ARRAYS = ('mean', 'scale', 'components', 'pca_mean', 'centroids')
+
+
+def iter_array_chunks(X, chunk_size: int) -> Iterator[np.ndarray]:
+    """Consecutive row blocks of an array or memmap as float64."""
+    for start in range(0, len(X), chunk_size):
+        yield np.asarray(X[start:start + chunk_size], dtype=np.float64)
+
+
+def _chunk_source(X, chunk_size: int) -> Callable[[], Iterator[np.ndarray]]:
+    if callable(X):
+        return lambda: (np.asarray(chunk, dtype=np.float64) for chunk in X())
+    return lambda: iter_array_chunks(X, chunk_size)
+
+
+# 1. FAST ASSIGNMENT
+
+class ClusterAssigner:
+    """Standardise, project and assign to the nearest centroid with plain NumPy."""
+
+    def __init__(self, arrays: dict, block_size: int = 65536):
+        self.arrays = arrays
+        self.block_size = block_size
+        # fold standardisation and PCA centring into one affine map: (X - shift) @ W
+        self._W = (arrays['components'] / arrays['scale']).T
+        self._shift = arrays['mean'] + arrays['pca_mean'] * arrays['scale']
+        self._centroids = np.asarray(arrays['centroids'])
+        self._centroid_sq = (self._centroids ** 2).sum(axis=1)
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self._centroids)
+
+    def transform(self, X) -> np.ndarray:
+        """Project raw rows into the PCA space."""
+        return (np.asarray(X, dtype=np.float64) - self._shift) @ self._W
+
+    def predict(self, X) -> np.ndarray:
+        """Nearest-centroid label per row, computed in blocks of ``block_size`` rows."""
+        X = np.asarray(X, dtype=np.float64)
+        labels = np.empty(len(X), dtype=np.int32)
+        for start in range(0, len(X), self.block_size):
+            Z = self.transform(X[start:start + self.block_size])
+            # ||z - c||^2 up to the per-row constant ||z||^2
+            labels[start:start + len(Z)] = np.argmin(self._centroid_sq - 2 * Z @ self._centroids.T, axis=1)
+        return labels
+
+    def inertia(self, X) -> float:
+        """Sum of squared distances from each projected row to its centroid."""
+        total = 0.0
+        X = np.asarray(X, dtype=np.float64)
+        for start in range(0, len(X), self.block_size):
+            Z = self.transform(X[start:start + self.block_size])
+            d = (Z ** 2).sum(axis=1)[:, None] + self._centroid_sq - 2 * Z @ self._centroids.T
+            total += float(np.maximum(d.min(axis=1), 0).sum())
+        return total
+
+
+def save_assigner(assigner: ClusterAssigner, directory: str) -> str:
+    """Write the assigner arrays as ``.npy`` files plus ``manifest.json``."""
+    os.makedirs(directory, exist_ok=True)
+    for name in ASSIGNER_ARRAYS:
+        np.save(os.path.join(directory, name + '.npy'), np.ascontiguousarray(assigner.arrays[name]))
+    manifest = {'arrays': list(ASSIGNER_ARRAYS), 'n_clusters': assigner.n_clusters,
+                'n_components': int(assigner.arrays['components'].shape[0]),
+                'n_features': int(assigner.arrays['components'].shape[1])}
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return directory
+
+
+def load_assigner(directory: str, mmap: bool = True, **kwargs) -> ClusterAssigner:
+    """Load a saved assigner; arrays are memory-mapped read-only with ``mmap=True``."""
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        manifest = json.load(f)
+    mode = 'r' if mmap else None
+    arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mode) for name in manifest['arrays']}
+    return ClusterAssigner(arrays, **kwargs)
+
+
+# 2. STREAMING FIT
+
+class StreamingPCAKMeans:
+    """StandardScaler -> IncrementalPCA -> MiniBatchKMeans, each fitted with ``partial_fit`` over chunks."""
+
+    def __init__(self, n_components: int = 2, n_clusters: int = 3, chunk_size: int = 10000, n_epochs: int = 1,
+                 random_state: int = 42):
+        self.n_components = n_components
+        self.n_clusters = n_clusters
+        self.chunk_size = chunk_size
+        self.n_epochs = n_epochs
+        self.random_state = random_state
+
+    def fit(self, X: Union[np.ndarray, Callable]) -> 'StreamingPCAKMeans':
+        """Fit on an array/memmap or a callable that returns a fresh chunk iterator."""
+        chunks = _chunk_source(X, self.chunk_size)
+        self.scaler_ = StandardScaler()
+        for chunk in chunks():
+            self.scaler_.partial_fit(chunk)
+        self.pca_ = IncrementalPCA(n_components=self.n_components)
+        pending = None
+        for chunk in chunks():
+            # partial_fit needs at least n_components rows; carry a short chunk into the next one
+            pending = chunk if pending is None else np.vstack([pending, chunk])
+            if len(pending) >= self.n_components:
+                self.pca_.partial_fit(self.scaler_.transform(pending))
+                pending = None
+        if not hasattr(self.pca_, 'components_'):
+            raise ValueError('Need at least n_components={} rows to fit PCA'.format(self.n_components))
+        self.kmeans_ = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=self.random_state, n_init=3)
+        for _ in range(self.n_epochs):
+            for chunk in chunks():
+                self.kmeans_.partial_fit(self.pca_.transform(self.scaler_.transform(chunk)))
+        self.assigner_ = self.to_assigner()
+        return self
+
+    def to_assigner(self) -> ClusterAssigner:
+        """NumPy-only assigner carrying the fitted scaler, projection and centroids."""
+        return ClusterAssigner({
+            'mean': self.scaler_.mean_,
+            'scale': self.scaler_.scale_,
+            'components': self.pca_.components_,
+            'pca_mean': self.pca_.mean_,
+            'centroids': self.kmeans_.cluster_centers_,
+        })
+
+    def predict(self, X) -> np.ndarray:
+        return self.assigner_.predict(X)
+
+    def transform(self, X) -> np.ndarray:
+        return self.assigner_.transform(X)
+
+    def save(self, directory: str) -> str:
+        return save_assigner(self.assigner_, directory)
+
+
+# 3. BATCH vs STREAMING BENCHMARK
+
+def batch_pca_kmeans(X, n_components: int = 2, n_clusters: int = 3, random_state: int = 42) -> tuple:
+    """The in-memory pipeline of ``pca_kmeans_example``; returns (assigner, labels)."""
+    scaler = StandardScaler().fit(X)
+    pca = PCA(n_components=n_components).fit(scaler.transform(X))
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_state).fit(pca.transform(scaler.transform(X)))
+    assigner = ClusterAssigner({'mean': scaler.mean_, 'scale': scaler.scale_, 'components': pca.components_,
+                                'pca_mean': pca.mean_, 'centroids': kmeans.cluster_centers_})
+    return assigner, kmeans.labels_
+
+
+def benchmark_clustering(X, n_components: int = 2, n_clusters: int = 3, chunk_size: int = 10000,
+                         random_state: int = 42) -> pd.DataFrame:
+    """Fit time, assignment time and inertia of batch vs streaming, plus label agreement (ARI).
+
+    Inertia is measured for both models in the batch PCA space so the numbers are comparable.
+    """
+    start = time.perf_counter()
+    batch, batch_labels = batch_pca_kmeans(X, n_components, n_clusters, random_state)
+    batch_fit = time.perf_counter() - start
+    start = time.perf_counter()
+    stream = StreamingPCAKMeans(n_components, n_clusters, chunk_size=chunk_size, random_state=random_state).fit(X)
+    stream_fit = time.perf_counter() - start
+
+    rows = []
+    for name, assigner, fit_s in (('batch', batch, batch_fit), ('streaming', stream.assigner_, stream_fit)):
+        start = time.perf_counter()
+        labels = assigner.predict(X)
+        assign_s = time.perf_counter() - start
+        Z = batch.transform(X)
+        centroids = np.vstack([Z[labels == k].mean(axis=0) for k in range(n_clusters) if np.any(labels == k)])
+        inertia = float(((Z - centroids[np.searchsorted(np.unique(labels), labels)]) ** 2).sum())
+        rows.append({'model': name, 'fit_s': fit_s, 'assign_s': assign_s, 'inertia': inertia,
+                     'ari_vs_batch': adjusted_rand_score(batch_labels, labels)})
+    return pd.DataFrame(rows).set_index('model')
+
+
+if __name__ == "__main__":
+    import tempfile
+    from sklearn.datasets import make_blobs
+
+    print("--- Streaming PCA + Mini-batch KMeans ---")
+    X, _ = make_blobs(n_samples=500000, n_features=20, centers=5, cluster_std=4.0, random_state=42)
+    print(benchmark_clustering(X, n_components=2, n_clusters=5, chunk_size=50000).round(3))
+    model = StreamingPCAKMeans(n_components=2, n_clusters=5, chunk_size=50000).fit(X)
+    with tempfile.TemporaryDirectory() as tmp:
+        model.save(os.path.join(tmp, 'clusters'))
+        loaded = load_assigner(os.path.join(tmp, 'clusters'))
+        print('Reloaded assigner agrees:', np.array_equal(loaded.predict(X[:1000]), model.predict(X[:1000])))
@@ -0,0 +1,40 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from sklearn.datasets import load_digits
+from sklearn.neighbors import NearestNeighbors
+from data_science.ann_index import IVFIndex, brute_force_knn, recall_at_k
+
+class TestANNIndex(unittest.TestCase):
+    def setUp(self):
+        X, _ = load_digits(return_X_y=True)
+        self.base, self.queries = X[:1500].astype(np.float32), X[1500:].astype(np.float32)
+
+    def test_brute_force_matches_sklearn(self):
+        distances, indices = brute_force_knn(self.base, self.queries, k=5)
+        ref_d, _ = NearestNeighbors(n_neighbors=5).fit(self.base).kneighbors(self.queries)
+        self.assertTrue(np.allclose(np.sqrt(distances), ref_d, atol=1e-2))
+        self.assertEqual(recall_at_k(indices, indices), 1.0)
+
+    def test_probing_every_list_is_exact(self):
+        index = IVFIndex(n_lists=16).build(self.base)
+        _, exact = brute_force_knn(self.base, self.queries, k=10)
+        _, approx = index.search(self.queries, k=10, n_probe=16)
+        self.assertGreater(recall_at_k(approx, exact), 0.99)  # ties aside, a full scan is exact
+        _, few = index.search(self.queries, k=10, n_probe=2)
+        self.assertGreater(recall_at_k(few, exact), 0.7)
+        self.assertLessEqual(recall_at_k(few, exact), recall_at_k(approx, exact))
+
+    def test_save_and_load(self):
+        index = IVFIndex(n_lists=12, n_probe=3).build(self.base)
+        with tempfile.TemporaryDirectory() as tmp:
+            index.save(os.path.join(tmp, 'ivf'))
+            loaded = IVFIndex.load(os.path.join(tmp, 'ivf'))
+            self.assertEqual(loaded.n_probe, 3)
+            for a, b in zip(loaded.search(self.queries, k=4), index.search(self.queries, k=4)):
+                self.assertTrue(np.array_equal(a, b))
+            del loaded
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+import numpy as np
+from sklearn.datasets import load_breast_cancer, make_friedman1
+from sklearn.metrics import r2_score
+from data_science import boosting
+from data_science.boosting import BoostedClassifier, BoostedRegressor, FeatureBinner, resolve_backend
+from data_science.pipeline_cache import StepCache
+
+class TestBoosting(unittest.TestCase):
+    def test_resolve_backend_falls_back_to_hist(self):
+        with mock.patch.object(boosting, 'xgboost', None):
+            self.assertEqual(resolve_backend('auto'), 'hist')
+            with self.assertRaises(ImportError):
+                resolve_backend('xgboost')
+        with self.assertRaises(ValueError):
+            resolve_backend('lightgbm')
+
+    def test_binner_codes(self):
+        X = np.column_stack([np.arange(1000.0), np.repeat([0.0, 1.0], 500)])
+        X[5, 0] = np.nan
+        binner = FeatureBinner(max_bins=16).fit(X)
+        codes = binner.transform(X)
+        self.assertEqual(codes.dtype, np.uint8)
+        self.assertEqual(codes[5, 0], 15)
+        self.assertLessEqual(codes[np.arange(1000) != 5, 0].max(), 14)
+        self.assertTrue(np.all(np.diff(codes[6:, 0].astype(int)) >= 0))
+        self.assertEqual(set(codes[:, 1]), {0, 1})
+
+    def test_regressor_uses_cached_bins(self):
+        X, y = make_friedman1(n_samples=2000, random_state=0)
+        cache = StepCache()
+        model = BoostedRegressor(backend='hist', n_estimators=50, cache=cache).fit(X[:1500], y[:1500])
+        BoostedRegressor(backend='hist', n_estimators=80, cache=cache).fit(X[:1500], y[:1500])
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertGreater(r2_score(y[1500:], model.predict(X[1500:])), 0.8)
+
+    def test_classifier_keeps_labels(self):
+        X, y = load_breast_cancer(return_X_y=True)
+        labels = np.where(y == 1, 'benign', 'malignant')
+        clf = BoostedClassifier(backend='hist', n_estimators=30).fit(X, labels)
+        self.assertEqual(set(clf.predict(X)), {'benign', 'malignant'})
+        self.assertEqual(clf.predict_proba(X[:4]).shape, (4, 2))
+        self.assertGreater(clf.score(X, labels), 0.95)
+
+if __name__ == "__main__":
+    unittest.main()
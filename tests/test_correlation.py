@@ -0,0 +1,66 @@
+import unittest
+import numpy as np
+import pandas as pd
+from data_science.correlation import CorrelationAccumulator, blocked_gram, correlate, correlate_chunks
+
+class TestCorrelation(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        X = rng.standard_normal((600, 40)) + 1000.0
+        X[:, 1] += 2 * X[:, 0]
+        X[:, 2] = np.round(X[:, 2])  # ties for Spearman
+        self.frame = pd.DataFrame(X, columns=['c{}'.format(i) for i in range(40)])
+        self.frame['label'] = 'x'
+        self.missing = self.frame.drop(columns='label').mask(rng.random(X.shape) < 0.1)
+
+    def assertMatches(self, ours, expected, atol=1e-5):
+        self.assertEqual(list(ours.columns), list(expected.columns))
+        self.assertTrue(np.array_equal(np.isnan(ours.to_numpy()), np.isnan(expected.to_numpy())))
+        self.assertTrue(np.allclose(ours.to_numpy(), expected.to_numpy(), atol=atol, equal_nan=True))
+
+    def test_blocked_gram(self):
+        A = np.random.default_rng(1).standard_normal((50, 70))
+        self.assertTrue(np.allclose(blocked_gram(A, block_size=16, n_jobs=3), A.T @ A))
+        self.assertTrue(np.allclose(blocked_gram(A, A[:, :20] ** 2, block_size=16), A.T @ (A[:, :20] ** 2)))
+
+    def test_pearson_and_spearman_match_pandas(self):
+        self.assertMatches(correlate(self.frame, block_size=8, row_chunk=128),
+                           self.frame.corr(numeric_only=True))
+        self.assertMatches(correlate(self.frame, method='spearman'), self.frame.corr(method='spearman',
+                                                                                     numeric_only=True))
+        self.assertIsInstance(correlate(self.frame.drop(columns='label').to_numpy()), np.ndarray)
+        with self.assertRaises(ValueError):
+            correlate(self.frame, method='kendall')
+
+    def test_bool_columns_are_kept_like_pandas(self):
+        frame = self.frame.iloc[:, :5].copy()
+        frame['flag'] = frame['c0'] > 1000.0
+        frame['maybe'] = pd.array(frame['c1'] > 2000.0, dtype='boolean')
+        frame.loc[::9, 'maybe'] = pd.NA
+        frame['label'] = 'x'
+        expected = frame.corr(numeric_only=True)
+        self.assertMatches(correlate(frame), expected)
+        chunks = (frame.iloc[start:start + 100] for start in range(0, len(frame), 100))
+        self.assertMatches(correlate_chunks(chunks), expected)
+
+    def test_missing_values_are_pairwise_complete(self):
+        frame = self.missing.copy()
+        frame['c5'] = 3.0  # constant column -> NaN row/column
+        frame.loc[5:, 'c7'] = np.nan  # too few rows for min_periods
+        self.assertMatches(correlate(frame, block_size=8), frame.corr())
+        self.assertMatches(correlate(frame, min_periods=50), frame.corr(min_periods=50))
+
+    def test_streaming_and_merge(self):
+        expected = self.missing.corr()
+        chunks = [self.missing.iloc[i:i + 100] for i in range(0, 600, 100)]
+        self.assertMatches(correlate_chunks(chunks), expected)
+        first = CorrelationAccumulator().update(chunks[0])
+        parts = [first.empty_like().update(chunk) for chunk in chunks[1:]]
+        for part in parts:
+            first.merge(part)
+        self.assertMatches(first.result(), expected)
+        with self.assertRaises(ValueError):
+            first.merge(CorrelationAccumulator().update(chunks[1]))
+
+if __name__ == "__main__":
+    unittest.main()
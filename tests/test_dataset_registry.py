@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_iris, load_wine
+from sklearn.model_selection import train_test_split
+from data_science.dataset_registry import DatasetRegistry
+
+class TestDatasetRegistry(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.registry = DatasetRegistry(cache_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_loads_once_and_reuses_disk_copy(self):
+        X, y = self.registry.arrays('iris')
+        self.registry.arrays('iris')
+        self.registry.frames('iris')
+        self.assertEqual(self.registry.loads, 1)
+        fresh = DatasetRegistry(cache_dir=self.tmp.name)
+        X2, y2 = fresh.arrays('iris')
+        self.assertEqual(fresh.loads, 0)
+        self.assertTrue(np.array_equal(X, X2) and np.array_equal(y, y2))
+
+    def test_arrays_are_read_only(self):
+        X, y = self.registry.arrays('wine')
+        self.assertFalse(X.flags.writeable)
+        with self.assertRaises(ValueError):
+            X[0, 0] = 0
+
+    def test_frames_match_sklearn_and_edits_stay_local(self):
+        X_ref, y_ref = load_wine(return_X_y=True, as_frame=True)
+        X, y = self.registry.frames('wine')
+        pd.testing.assert_frame_equal(X, X_ref)
+        pd.testing.assert_series_equal(y, y_ref)
+        X.iloc[0, 0] = -1.0
+        self.assertEqual(self.registry.frames('wine')[0].iloc[0, 0], X_ref.iloc[0, 0])
+
+    def test_split_matches_train_test_split(self):
+        X, y = load_iris(return_X_y=True)
+        expected = train_test_split(X, y, test_size=0.25, random_state=7, stratify=y)
+        result = self.registry.split('iris', test_size=0.25, random_state=7, stratify=True)
+        for a, b in zip(expected, result):
+            self.assertTrue(np.array_equal(a, b))
+        self.assertIs(self.registry.split_indices('iris', 0.25, 7, True),
+                      self.registry.split_indices('iris', 0.25, 7, True))
+
+    def test_disk_copy_is_opt_in(self):
+        with mock.patch.dict(os.environ, {'DATA_SCIENCE_CACHE': ''}):
+            registry = DatasetRegistry()
+        self.assertIsNone(registry.cache_dir)
+        registry.arrays('iris')
+        registry.split_indices('iris')
+        registry.table('sales')
+        self.assertEqual(registry.loads, 2)
+        with mock.patch.dict(os.environ, {'DATA_SCIENCE_CACHE': self.tmp.name}):
+            self.assertEqual(DatasetRegistry().cache_dir, self.tmp.name)
+
+    def test_repo_table(self):
+        titanic = self.registry.table('titanic')
+        self.assertIn('Survived', titanic.columns)
+        with self.assertRaises(KeyError):
+            self.registry.table('missing')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from sklearn.decomposition import PCA
+from data_science.dim_reduction import FastPCA, choose_solver, subspace_similarity
+from data_science.pipeline_cache import StepCache
+
+class TestDimReduction(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.X = rng.standard_normal((400, 6)) @ rng.standard_normal((6, 800)) + 0.1 * rng.standard_normal((400, 800))
+
+    def test_choose_solver(self):
+        self.assertEqual(choose_solver(150, 4, 2), 'full')
+        self.assertEqual(choose_solver(100000, 50, 5), 'covariance_eigh')
+        self.assertEqual(choose_solver(10000, 10000, 50), 'randomized')
+
+    def test_solvers_match_sklearn(self):
+        reference = PCA(5, svd_solver='full').fit(self.X)
+        for solver in ('full', 'covariance_eigh', 'randomized'):
+            model = FastPCA(5, solver=solver, cache=None).fit(self.X)
+            self.assertTrue(np.allclose(model.components_, reference.components_, atol=1e-6), solver)
+            self.assertTrue(np.allclose(model.transform(self.X), reference.transform(self.X), atol=1e-6), solver)
+            self.assertTrue(np.allclose(model.explained_variance_ratio_, reference.explained_variance_ratio_))
+
+    def test_float32_end_to_end_and_blocked_transform(self):
+        X32 = self.X.astype(np.float32)
+        model = FastPCA(5, solver='randomized', cache=None, block_rows=37).fit(X32)
+        Z = model.transform(X32)
+        self.assertEqual(model.components_.dtype, np.float32)
+        self.assertEqual(Z.dtype, np.float32)
+        reference = FastPCA(5, solver='randomized', dtype=np.float64, cache=None).fit(self.X)
+        self.assertGreater(subspace_similarity(model.components_, reference.components_), 0.9999)
+        self.assertTrue(np.allclose(Z, reference.transform(self.X), atol=1e-2))
+
+    def test_fit_is_cached_per_input(self):
+        cache = StepCache()
+        FastPCA(3, cache=cache).fit(self.X)
+        FastPCA(3, cache=cache, block_rows=10).fit(self.X)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        FastPCA(3, cache=cache).fit(self.X[:200])
+        self.assertEqual(cache.misses, 2)
+
+    def test_cached_fits_do_not_share_arrays(self):
+        cache = StepCache()
+        first = FastPCA(3, cache=cache).fit(self.X)
+        second = FastPCA(3, cache=cache).fit(self.X)
+        self.assertEqual(cache.hits, 1)
+        expected = second.components_.copy()
+        first.components_ *= -1
+        first.mean_[:] = 0
+        self.assertTrue(np.array_equal(second.components_, expected))
+        self.assertTrue(np.array_equal(FastPCA(3, cache=cache).fit(self.X).components_, expected))
+        self.assertFalse(np.shares_memory(first.mean_, second.mean_))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from sklearn.datasets import load_diabetes
+from sklearn.ensemble import VotingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import cross_val_predict
+from sklearn.tree import DecisionTreeRegressor
+from data_science.ensembling import (MeanCombiner, RankAverager, RidgeStacker, compute_oof,
+                                     evaluate_combinations, make_folds)
+from data_science.pipeline_cache import StepCache
+
+class TestEnsembling(unittest.TestCase):
+    def setUp(self):
+        X, y = load_diabetes(return_X_y=True)
+        self.X, self.y = X[:300], y[:300]
+        self.X_test, self.y_test = X[300:], y[300:]
+        self.estimators = [('tree', DecisionTreeRegressor(max_depth=3, random_state=0)), ('ridge', Ridge(alpha=0.1))]
+
+    def test_mean_of_oof_matches_voting_regressor(self):
+        folds = make_folds(self.y, cv=4)
+        oof = compute_oof(self.estimators, self.X, self.y, folds=folds, cache=None)
+        expected = cross_val_predict(VotingRegressor(self.estimators), self.X, self.y, cv=folds)
+        self.assertTrue(np.allclose(MeanCombiner().fit(oof.oof).predict(oof.oof), expected))
+
+    def test_cache_fits_each_model_once(self):
+        cache = StepCache()
+        compute_oof(self.estimators[:1], self.X, self.y, X_test=self.X_test, cache=cache)
+        oof = compute_oof(self.estimators, self.X, self.y, X_test=self.X_test, cache=cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(oof.oof.shape, (300, 2))
+        self.assertEqual(oof.test.shape, (len(self.X_test), 2))
+
+    def test_combiners(self):
+        P = np.column_stack([self.y + 5, 2 * self.y])
+        self.assertTrue(np.allclose(MeanCombiner(weights=[1, 0]).fit(P).predict(P), self.y + 5))
+        self.assertGreater(RidgeStacker().fit(P, self.y).score(P, self.y), 0.999)
+        ranked = RankAverager().fit(P).predict(P)
+        self.assertTrue(np.array_equal(np.argsort(ranked, kind='stable'), np.argsort(self.y, kind='stable')))
+
+    def test_evaluate_combinations(self):
+        oof = compute_oof(self.estimators, self.X, self.y, X_test=self.X_test, cv=3)
+        table = evaluate_combinations(oof, y_test=self.y_test)
+        self.assertEqual(len(table), 3 * 3)
+        self.assertIn('test_score', table.columns)
+        self.assertTrue(table['cv_score'].is_monotonic_decreasing)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from sklearn import metrics
+from data_science import evaluation_metrics as em
+
+class TestEvaluationMetrics(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.y = rng.integers(0, 2, 200)
+        # rounded scores so that tied thresholds are exercised
+        self.scores = np.round(np.clip(self.y * 0.3 + rng.random(200) * 0.7, 0, 1), 2)
+
+    def test_curves_match_sklearn(self):
+        curve = em.ThresholdCurve(self.y, self.scores)
+        for ours, ref in zip(curve.roc(), metrics.roc_curve(self.y, self.scores)):
+            self.assertTrue(np.allclose(ours, ref))
+        for ours, ref in zip(curve.precision_recall(), metrics.precision_recall_curve(self.y, self.scores)):
+            self.assertTrue(np.allclose(ours, ref))
+        self.assertAlmostEqual(curve.roc_auc(), metrics.roc_auc_score(self.y, self.scores), places=12)
+        self.assertAlmostEqual(curve.average_precision(), metrics.average_precision_score(self.y, self.scores), places=12)
+        self.assertIn(0.5, self.scores)  # a score exactly at the cut-off predicts negative
+        expected = metrics.confusion_matrix(self.y, (self.scores > 0.5).astype(int))
+        self.assertTrue(np.array_equal(curve.confusion_at(0.5), expected))
+
+    def test_label_report_matches_sklearn(self):
+        rng = np.random.default_rng(1)
+        y_true, y_pred = rng.integers(0, 3, 100), rng.integers(0, 3, 100)
+        report = em.evaluate_labels(y_true, y_pred)
+        self.assertTrue(np.array_equal(report['confusion_matrix'], metrics.confusion_matrix(y_true, y_pred)))
+        ref = metrics.classification_report(y_true, y_pred, output_dict=True)
+        self.assertAlmostEqual(report['report'].loc['macro avg', 'f1-score'], ref['macro avg']['f1-score'])
+        self.assertAlmostEqual(report['report'].loc['accuracy', 'f1-score'], ref['accuracy'])
+
+    def test_confusion_matrix_with_unsorted_labels(self):
+        y_true, y_pred = ['a', 'b', 'b', 'c', 'a'], ['b', 'b', 'a', 'c', 'a']
+        matrix, labels = em.fast_confusion_matrix(y_true, y_pred, labels=['c', 'b', 'a'])
+        self.assertListEqual(list(labels), ['c', 'b', 'a'])
+        self.assertTrue(np.array_equal(matrix, metrics.confusion_matrix(y_true, y_pred, labels=['c', 'b', 'a'])))
+
+    def test_confusion_matrix_with_labels_subset(self):
+        y_true, y_pred = [0, 1, 2, 2, 1, 0], [0, 2, 2, 1, 1, 1]
+        report = em.evaluate_labels(y_true, y_pred, labels=[1, 0])
+        self.assertTrue(np.array_equal(report['confusion_matrix'],
+                                       metrics.confusion_matrix(y_true, y_pred, labels=[1, 0])))
+        self.assertListEqual(list(report['report'].index[:2]), ['1', '0'])
+
+    def test_report_without_support(self):
+        # every row falls outside the requested labels
+        report = em.evaluate_labels([0, 1, 1], [1, 0, 0], labels=[2, 3])['report']
+        ref = metrics.classification_report([0, 1, 1], [1, 0, 0], labels=[2, 3], output_dict=True, zero_division=0)
+        self.assertEqual(report.loc['weighted avg', 'f1-score'], ref['weighted avg']['f1-score'])
+        self.assertEqual(report.loc['weighted avg', 'support'], 0)
+
+    def test_multiclass_auc(self):
+        rng = np.random.default_rng(2)
+        proba = rng.dirichlet(np.ones(3), size=90)
+        y_true = np.repeat([0, 1, 2], 30)
+        result = em.evaluate_proba(y_true, proba, classes=[0, 1, 2])
+        self.assertAlmostEqual(result['roc_auc'], metrics.roc_auc_score(y_true, proba, multi_class='ovr'))
+
+    def test_bootstrap_weights_match_resampling(self):
+        weights = next(em.bootstrap_weights(len(self.y), 5, random_state=3))
+        curve = em.ThresholdCurve(self.y, self.scores)
+        aucs = em._weighted_roc_auc(curve, weights)
+        for w, auc in zip(weights, aucs):
+            idx = np.repeat(np.arange(len(self.y)), w.astype(int))
+            self.assertAlmostEqual(auc, metrics.roc_auc_score(self.y[idx], self.scores[idx]), places=10)
+
+    def test_bootstrap_ci_brackets_estimate(self):
+        preds = (self.scores >= 0.5).astype(int)
+        ci = em.bootstrap_ci(self.y, y_score=self.scores, y_pred=preds, n_boot=200)
+        self.assertEqual(list(ci.index), list(em.SCORE_METRICS + em.LABEL_METRICS))
+        self.assertTrue(((ci['low'] <= ci['estimate']) & (ci['estimate'] <= ci['high'])).all())
+        with self.assertRaises(ValueError):
+            em.bootstrap_ci(self.y, y_score=self.scores, metrics=['accuracy'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from data_science import data_visualization, matplotlib_intro
+from data_science.figure_renderer import PLOT_KINDS, build_figure, register_plot, render_batch
+
+class TestFigureRenderer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_example_specs_render_without_pyplot(self):
+        plt.close('all')
+        specs = data_visualization.figure_specs() + matplotlib_intro.figure_specs()
+        report = render_batch(specs, self.tmp.name, n_jobs=1)
+        self.assertEqual(len(report), len(specs))
+        self.assertTrue(report['error'].isna().all())
+        self.assertTrue((report['bytes'] > 0).all())
+        self.assertEqual(plt.get_fignums(), [])
+
+    def test_process_pool_and_formats(self):
+        specs = [{'name': 'line_{}'.format(i), 'kind': 'line', 'y': np.arange(10) * i} for i in range(4)]
+        specs.append({'name': 'heat', 'kind': 'heatmap', 'matrix': np.eye(3), 'format': 'svg'})
+        report = render_batch(specs, self.tmp.name, n_jobs=2, chunk_size=2)
+        self.assertEqual(list(report.index), [spec['name'] for spec in specs])
+        self.assertEqual(report.loc['heat', 'format'], 'svg')
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'heat.svg')))
+        self.assertTrue((report['render_s'] > 0).all())
+
+    def test_errors_are_reported_per_figure(self):
+        report = render_batch([{'name': 'ok', 'kind': 'bar', 'x': ['a'], 'y': [1]}, {'name': 'bad', 'kind': 'pie'}],
+                              self.tmp.name, n_jobs=1)
+        self.assertTrue(report['error'].isna()['ok'])
+        self.assertIn('Unknown plot kind', report.loc['bad', 'error'])
+        with self.assertRaises(ValueError):
+            render_batch([{'name': 'x', 'kind': 'line', 'y': [1]}] * 2, self.tmp.name)
+
+    def test_box_tick_labels(self):
+        fig = build_figure({'name': 'box', 'kind': 'box', 'groups': {'a': [1, 2, 3], 'b': [2, 5]}})
+        self.assertEqual([label.get_text() for label in fig.axes[0].get_xticklabels()], ['a', 'b'])
+
+    def test_register_plot_and_panels(self):
+        @register_plot('step')
+        def draw_step(ax, spec):
+            ax.step(range(len(spec['y'])), spec['y'])
+        try:
+            fig = build_figure({'name': 'p', 'layout': (1, 3), 'panels': [{'kind': 'step', 'y': [1, 2]},
+                                                                         {'kind': 'hist', 'values': [1, 2, 2]}]})
+            self.assertEqual(sum(ax.get_visible() for ax in fig.axes), 2)
+        finally:
+            del PLOT_KINDS['step']
+
+if __name__ == "__main__":
+    unittest.main()
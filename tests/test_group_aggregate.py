@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_science.group_aggregate import GroupAggregator, aggregate_stream, hll_estimate, hll_registers, read_records
+
+AGGS = {'revenue': ['sum', 'mean', 'min', 'max'], 'units': ['sum', 'count']}
+
+
+def sales(n=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'item': rng.choice(['Widget', 'Gadget', 'Gizmo', 'Doohickey'], n),
+                          'store': rng.integers(0, 30, n), 'customer': rng.integers(0, 5000, n),
+                          'units': rng.integers(1, 10, n).astype(float), 'revenue': rng.gamma(2.0, 30.0, n)})
+    frame.loc[rng.random(n) < 0.05, 'revenue'] = np.nan
+    frame.loc[rng.random(n) < 0.01, 'item'] = None
+    return frame
+
+
+class TestHyperLogLog(unittest.TestCase):
+    def test_estimate_within_error(self):
+        values = np.arange(200000) % 50000
+        keys = pd.DataFrame({'k': np.zeros(len(values), dtype=int)})
+        estimate = hll_estimate(hll_registers(keys, values, 12), ['k'], 12).iloc[0]
+        self.assertLess(abs(estimate - 50000) / 50000, 0.05)
+
+    def test_small_sets_are_exact(self):
+        keys = pd.DataFrame({'k': [1, 1, 1, 2, 2]})
+        estimate = hll_estimate(hll_registers(keys, np.array([7, 8, 7, 9, np.nan]), 10), ['k'], 10)
+        self.assertEqual(estimate.round().to_dict(), {1: 2.0, 2: 1.0})
+
+
+class TestGroupAggregator(unittest.TestCase):
+    def test_matches_pandas_in_memory(self):
+        frame = sales()
+        ours = aggregate_stream(frame, ['item', 'store'], AGGS, chunk_size=3000)
+        expected = frame.groupby(['item', 'store']).agg(AGGS)
+        pd.testing.assert_frame_equal(ours[expected.columns], expected, check_dtype=False, check_names=False)
+
+    def test_spills_to_disk_and_merges(self):
+        frame = sales()
+        with tempfile.TemporaryDirectory() as tmp:
+            aggregator = GroupAggregator('store', dict(AGGS, customer=['nunique_approx']), memory_budget=2000,
+                                         spill_dir=tmp, n_partitions=4)
+            for start in range(0, len(frame), 2500):
+                aggregator.update(frame.iloc[start:start + 2500])
+            self.assertGreater(aggregator.runs, 1)
+            self.assertTrue(any(name.endswith('.pkl') for name in os.listdir(tmp)))
+            ours = aggregator.result()
+        self.assertEqual(aggregator.runs, 0)
+        self.assertIs(aggregator.result(), ours)
+        with self.assertRaises(RuntimeError):
+            aggregator.update(frame)
+        expected = frame.groupby('store').agg(AGGS)
+        pd.testing.assert_frame_equal(ours[expected.columns], expected, check_dtype=False, check_names=False)
+        distinct = frame.groupby('store')['customer'].nunique()
+        error = (ours[('customer', 'nunique_approx')] - distinct).abs() / distinct
+        self.assertLess(error.mean(), 0.05)
+
+    def test_spilled_keys_survive_dtype_drift_between_chunks(self):
+        frame = sales()[['store', 'units', 'revenue']]
+        frame['store'] = frame['store'].astype('Int64')
+        frame.loc[frame.index[-11:], 'store'] = pd.NA  # the last CSV chunk reads 'store' as float64
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'sales.csv')
+            frame.to_csv(path, index=False)
+            dtypes = {str(chunk['store'].dtype) for chunk in read_records(path, 5000)()}
+            self.assertEqual(dtypes, {'int64', 'float64'})
+            ours = aggregate_stream(read_records(path, 5000), 'store', AGGS, memory_budget=500, n_partitions=4)
+            expected = pd.read_csv(path).groupby('store').agg(AGGS)
+        self.assertEqual(len(ours), 30)
+        pd.testing.assert_frame_equal(ours[expected.columns], expected, check_dtype=False, check_names=False,
+                                      check_index_type=False)
+
+    def test_reads_csv_and_json_lines(self):
+        frame = sales(3000)
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path, jsonl_path = os.path.join(tmp, 'sales.csv'), os.path.join(tmp, 'sales.jsonl')
+            frame.to_csv(csv_path, index=False)
+            frame.to_json(jsonl_path, orient='records', lines=True)
+            results = [aggregate_stream(read_records(path, chunk_size=700), 'item', AGGS)
+                       for path in (csv_path, jsonl_path)]
+        expected = frame.groupby('item').agg(AGGS)
+        for ours in results:
+            pd.testing.assert_frame_equal(ours[expected.columns], expected, check_dtype=False, check_names=False)
+
+    def test_rejects_unknown_aggregate(self):
+        with self.assertRaises(ValueError):
+            GroupAggregator('item', {'revenue': ['median']})
+
+
+if __name__ == '__main__':
+    unittest.main()
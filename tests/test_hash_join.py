@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_science.hash_join import HashIndex, HashJoin, file_version, hash_join, join_frames, load_or_build_index
+
+
+def tables(n_fact=4000, n_dimension=300, duplicate_keys=False, seed=0):
+    rng = np.random.default_rng(seed)
+    keys = rng.integers(0, 200, n_dimension) if duplicate_keys else rng.permutation(n_dimension)
+    dimension = pd.DataFrame({'key': keys.astype(float), 'category': rng.choice(['a', 'b', 'c'], n_dimension),
+                              'price': rng.normal(size=n_dimension), 'units': rng.integers(0, 5, n_dimension)})
+    fact = pd.DataFrame({'key': rng.integers(-20, 250, n_fact).astype(float),
+                         'units': rng.integers(0, 9, n_fact), 'store': rng.choice(['x', 'y'], n_fact)})
+    dimension.loc[3, 'key'] = np.nan
+    fact.loc[10, 'key'] = np.nan
+    return fact, dimension
+
+
+class TestHashJoin(unittest.TestCase):
+    def test_inner_and_left_match_merge(self):
+        for duplicate_keys in (False, True):
+            fact, dimension = tables(duplicate_keys=duplicate_keys)
+            for how in ('inner', 'left'):
+                with self.subTest(duplicate_keys=duplicate_keys, how=how):
+                    pd.testing.assert_frame_equal(join_frames(fact, dimension, on='key', how=how, chunk_size=700),
+                                                  pd.merge(fact, dimension, on='key', how=how))
+
+    def test_outer_has_the_same_rows_as_merge(self):
+        fact, dimension = tables(duplicate_keys=True)
+        ours = join_frames(fact, dimension, on='key', how='outer', chunk_size=700)
+        expected = pd.merge(fact, dimension, on='key', how='outer')
+        columns = list(expected.columns)
+        pd.testing.assert_frame_equal(ours.sort_values(columns, ignore_index=True),
+                                      expected.sort_values(columns, ignore_index=True))
+
+    def test_multiple_key_columns(self):
+        rng = np.random.default_rng(1)
+        dimension = pd.DataFrame({'a': rng.integers(0, 10, 50), 'b': rng.choice(['p', 'q'], 50),
+                                  'weight': rng.normal(size=50)})
+        fact = pd.DataFrame({'a': rng.integers(0, 12, 1000), 'b': rng.choice(['p', 'q', 'r'], 1000)})
+        pd.testing.assert_frame_equal(join_frames(fact, dimension, on=['a', 'b'], how='left', chunk_size=128),
+                                      pd.merge(fact, dimension, on=['a', 'b'], how='left'))
+
+    def test_chunk_callable_and_prebuilt_index(self):
+        fact, dimension = tables()
+        index = HashIndex.build(dimension, 'key')
+        chunks = list(hash_join(lambda: (fact.iloc[i:i + 1500] for i in range(0, len(fact), 1500)), index,
+                                how='inner'))
+        self.assertEqual(len(chunks), 3)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True),
+                                      pd.merge(fact, dimension, on='key', how='inner'))
+
+    def test_invalid_join_type(self):
+        _, dimension = tables()
+        with self.assertRaises(ValueError):
+            HashJoin(HashIndex.build(dimension, 'key'), how='cross')
+
+
+class TestPersistedIndex(unittest.TestCase):
+    def test_save_load_and_reuse(self):
+        fact, dimension = tables(duplicate_keys=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            built = load_or_build_index(dimension, 'key', tmp, 'v1')
+            stamp = os.path.getmtime(os.path.join(tmp, 'order.npy'))
+            reused = load_or_build_index(lambda: self.fail('a reused index must not load the dimension'), 'key',
+                                         tmp, 'v1')
+            self.assertEqual(os.path.getmtime(os.path.join(tmp, 'order.npy')), stamp)
+            np.testing.assert_array_equal(reused.order, built.order)
+            pd.testing.assert_frame_equal(join_frames(fact, reused, how='left'),
+                                          pd.merge(fact, dimension, on='key', how='left'))
+            changed = dimension.assign(price=dimension['price'] + 1)
+            rebuilt = load_or_build_index(changed, 'key', tmp, 'v2')
+            pd.testing.assert_frame_equal(rebuilt.dimension, changed)
+            del built, reused, rebuilt  # release the memory maps before the directory is removed
+
+    def test_file_version_tracks_modification(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'dimension.csv')
+            tables()[1].to_csv(path, index=False)
+            version = file_version(path)
+            self.assertEqual(file_version(path), version)
+            os.utime(path, ns=(0, 0))
+            self.assertNotEqual(file_version(path), version)
+
+
+if __name__ == '__main__':
+    unittest.main()
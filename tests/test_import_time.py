@@ -0,0 +1,35 @@
+import sys
+import unittest
+from data_science.lazy_imports import LazyModule, import_report, import_times, lazy_import
+
+# Cold-start budgets in milliseconds; generous so that a loaded CI machine does not flake
+PACKAGE_BUDGET_MS = 100
+PLOTTING_MODULE_BUDGET_MS = 1500
+
+class TestImportTime(unittest.TestCase):
+    def test_package_cold_start_budget(self):
+        # a bare `import data_science` must not pull in the scientific stack
+        times = import_times('data_science')
+        self.assertLess(times['data_science'] / 1000, PACKAGE_BUDGET_MS)
+        self.assertNotIn('pandas', times)
+        self.assertNotIn('numpy', times)
+        # nor may the lazy loader the plotting modules rely on
+        times = import_times('data_science.lazy_imports')
+        self.assertLess(times['data_science.lazy_imports'] / 1000, PACKAGE_BUDGET_MS)
+        self.assertNotIn('numpy', times)
+
+    def test_plotting_modules_defer_plotting_libraries(self):
+        modules = ['data_science.data_visualization', 'data_science.matplotlib_intro', 'data_science.seaborn_intro']
+        for module, ms, heavy in import_report(modules):
+            self.assertEqual(heavy, [], module)
+            self.assertLess(ms, PLOTTING_MODULE_BUDGET_MS, module)
+
+    def test_lazy_module_loads_on_first_use(self):
+        proxy = LazyModule('json')
+        self.assertIn('not loaded', repr(proxy))
+        self.assertEqual(proxy.dumps([1]), '[1]')
+        self.assertNotIn('not loaded', repr(proxy))
+        self.assertIs(lazy_import('sys'), sys)
+
+if __name__ == "__main__":
+    unittest.main()
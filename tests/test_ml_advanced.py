@@ -1,5 +1,6 @@
 import unittest
 import os
+import shutil
 from data_science import ml_advanced
 import joblib
 
@@ -34,6 +35,8 @@ class TestMLAdvanced(unittest.TestCase):
         loaded = joblib.load('rf_model.joblib')
         self.assertTrue(hasattr(loaded, 'predict'))
         os.remove('rf_model.joblib')
+        self.assertTrue(os.path.exists('rf_model_store/manifest.json'))
+        shutil.rmtree('rf_model_store')
 
     def test_feature_importance_example(self):
         try:
@@ -0,0 +1,60 @@
+import multiprocessing
+import unittest
+import numpy as np
+from sklearn.datasets import load_diabetes, load_iris
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, LogisticRegression, Ridge
+from data_science import model_comparison
+
+class TestModelComparison(unittest.TestCase):
+    def setUp(self):
+        X, y = load_diabetes(return_X_y=True)
+        self.data = model_comparison.prepare_split(X, y)
+
+    def test_prepare_split_scales_once(self):
+        self.assertEqual(self.data['X_train'].shape[0], 353)
+        self.assertTrue(np.allclose(self.data['X_train_scaled'].mean(axis=0), 0))
+        self.assertFalse(np.allclose(self.data['X_test_scaled'].mean(axis=0), 0))
+
+    def test_shared_arrays_round_trip(self):
+        with model_comparison.SharedArrays(self.data) as shared:
+            arrays, handles = model_comparison.attach_shared(shared.spec)
+            self.assertTrue(np.array_equal(arrays['X_test'], self.data['X_test']))
+            self.assertFalse(arrays['X_test'].flags.writeable)
+            del arrays
+            for block in handles:
+                block.close()
+
+    def test_parallel_matches_serial(self):
+        candidates = [('Linear', LinearRegression(), True), ('Ridge', Ridge(), True),
+                      ('RF', RandomForestRegressor(n_estimators=10, random_state=0))]
+        parallel = model_comparison.compare_models(candidates, self.data, n_jobs=2)
+        serial = model_comparison.compare_models(candidates, self.data, n_jobs=1)
+        self.assertEqual(set(parallel.index), {'Linear', 'Ridge', 'RF'})
+        self.assertTrue(np.allclose(parallel.loc[serial.index, 'r2'], serial['r2']))
+        for column in ('mse', 'r2', 'fit_s', 'predict_s', 'size_bytes'):
+            self.assertIn(column, parallel.columns)
+        self.assertTrue(parallel['r2'].is_monotonic_decreasing)
+
+    def test_classification_metrics(self):
+        X, y = load_iris(return_X_y=True)
+        data = model_comparison.prepare_split(X, y, stratify=True)
+        table = model_comparison.compare_models(
+            [('LogReg', LogisticRegression(max_iter=200), True), ('RF', RandomForestClassifier(n_estimators=10))],
+            data, n_jobs=2)
+        self.assertIn('accuracy', table.columns)
+        self.assertIn('f1_macro', table.columns)
+        self.assertGreater(table['accuracy'].min(), 0.8)
+
+    def test_string_labels_under_spawn(self):
+        X, y = load_iris(return_X_y=True)
+        data = model_comparison.prepare_split(X, np.array(['setosa', 'versicolor', 'virginica'], dtype=object)[y])
+        with self.assertRaises(TypeError):
+            model_comparison.SharedArrays(data)
+        table = model_comparison.compare_models([('LogReg', LogisticRegression(max_iter=200), True)], data, n_jobs=1)
+        parallel = model_comparison.compare_models([('LogReg', LogisticRegression(max_iter=200), True)], data,
+                                                   n_jobs=2, mp_context=multiprocessing.get_context('spawn'))
+        self.assertAlmostEqual(parallel.loc['LogReg', 'accuracy'], table.loc['LogReg', 'accuracy'])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import json
+import os
+import tempfile
+import numpy as np
+from sklearn.datasets import load_iris, load_diabetes, load_breast_cancer
+from sklearn.ensemble import (RandomForestClassifier, RandomForestRegressor, ExtraTreesClassifier,
+                              GradientBoostingClassifier, GradientBoostingRegressor)
+from sklearn.exceptions import InconsistentVersionWarning
+from sklearn.linear_model import LogisticRegression
+from data_science import model_store
+
+class TestModelStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'store')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def round_trip(self, model):
+        model_store.save_model(model, self.path)
+        return model_store.load_model(self.path)
+
+    def test_forest_classifier_bit_compatible(self):
+        X, y = load_iris(return_X_y=True)
+        clf = RandomForestClassifier(n_estimators=20, random_state=42).fit(X, y)
+        stored = self.round_trip(clf)
+        self.assertTrue(np.array_equal(stored.predict_proba(X), clf.predict_proba(X)))
+        self.assertTrue(np.array_equal(stored.predict(X), clf.predict(X)))
+
+    def test_missing_values_follow_sklearn(self):
+        X, y = load_iris(return_X_y=True)
+        X = X.copy()
+        X[::7, 2] = np.nan
+        clf = ExtraTreesClassifier(n_estimators=10, random_state=0).fit(X, y)
+        stored = self.round_trip(clf)
+        self.assertTrue(np.array_equal(stored.predict_proba(X), clf.predict_proba(X)))
+
+    def test_regressors_bit_compatible(self):
+        X, y = load_diabetes(return_X_y=True)
+        for model in (RandomForestRegressor(n_estimators=10, random_state=42),
+                      GradientBoostingRegressor(n_estimators=30, random_state=42)):
+            model.fit(X, y)
+            stored = self.round_trip(model)
+            self.assertTrue(np.array_equal(stored.predict(X), model.predict(X)), type(model).__name__)
+
+    def test_gradient_boosting_classifiers(self):
+        X, y = load_breast_cancer(return_X_y=True)
+        binary = GradientBoostingClassifier(n_estimators=20, random_state=42).fit(X, y)
+        stored = self.round_trip(binary)
+        self.assertTrue(np.array_equal(stored.decision_function(X), binary.decision_function(X)))
+        self.assertTrue(np.array_equal(stored.predict(X), binary.predict(X)))
+        self.assertTrue(np.array_equal(stored.predict_proba(X), binary.predict_proba(X)))
+        X, y = load_iris(return_X_y=True)
+        multi = GradientBoostingClassifier(n_estimators=10, random_state=42).fit(X, y)
+        stored = self.round_trip(multi)
+        self.assertTrue(np.array_equal(stored.decision_function(X), multi.decision_function(X)))
+        self.assertTrue(np.array_equal(stored.predict(X), multi.predict(X)))
+
+    def test_load_is_memory_mapped(self):
+        X, y = load_iris(return_X_y=True)
+        stored = self.round_trip(GradientBoostingClassifier(n_estimators=5, random_state=0).fit(X, y))
+        for name, array in stored.arrays.items():
+            self.assertIsInstance(array, np.memmap, name)
+            self.assertFalse(array.flags.writeable, name)
+        self.assertEqual(stored.manifest['n_trees'], 15)
+
+    def test_rejects_wrong_shape(self):
+        X, y = load_iris(return_X_y=True)
+        stored = self.round_trip(RandomForestClassifier(n_estimators=2, random_state=0).fit(X, y))
+        with self.assertRaises(ValueError):
+            stored.predict(X[:, :2])
+
+    def test_other_sklearn_version_warns(self):
+        X, y = load_iris(return_X_y=True)
+        clf = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        model_store.save_model(clf, self.path)
+        manifest_path = os.path.join(self.path, 'manifest.json')
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        with open(manifest_path, 'w') as f:
+            json.dump(dict(manifest, sklearn_version='0.24.2'), f)
+        with self.assertWarns(InconsistentVersionWarning):
+            model_store.load_model(self.path)
+        with open(manifest_path, 'w') as f:
+            json.dump(dict(manifest, format_version=1), f)
+        with self.assertRaises(ValueError):
+            model_store.load_model(self.path)
+
+    def test_unsupported_model(self):
+        X, y = load_iris(return_X_y=True)
+        with self.assertRaises(TypeError):
+            model_store.save_model(LogisticRegression(max_iter=200).fit(X, y), self.path)
+
+    def test_benchmark_load(self):
+        X, y = load_iris(return_X_y=True)
+        clf = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+        results = model_store.benchmark_load(clf, self.path, repeats=2)
+        for key in ('joblib_load_s', 'store_load_s', 'speedup', 'joblib_bytes', 'store_bytes'):
+            self.assertIn(key, results)
+
+if __name__ == "__main__":
+    unittest.main()
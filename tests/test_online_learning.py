@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from sklearn.datasets import load_diabetes, load_wine
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.linear_model import SGDClassifier, SGDRegressor
+from sklearn.model_selection import train_test_split
+from data_science import online_learning
+
+class TestOnlineLearning(unittest.TestCase):
+    def setUp(self):
+        X, y = load_diabetes(return_X_y=True)
+        self.X_train, self.X_test, self.y_train, self.y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    def test_iter_chunks(self):
+        chunks = list(online_learning.iter_chunks(self.X_train, self.y_train, 100))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(sum(len(c[0]) for c in chunks), len(self.X_train))
+
+    def test_warm_start_adds_trees_per_chunk(self):
+        learner = online_learning.make_online(RandomForestRegressor(random_state=0), trees_per_chunk=5)
+        for X_chunk, y_chunk in online_learning.iter_chunks(self.X_train, self.y_train, 100):
+            learner.update(X_chunk, y_chunk)
+        self.assertEqual(len(learner.estimator.estimators_), 20)
+        self.assertEqual(learner.n_seen_, len(self.X_train))
+        gb = online_learning.make_online(GradientBoostingRegressor(random_state=0), trees_per_chunk=3)
+        gb.update(self.X_train[:100], self.y_train[:100]).update(self.X_train[100:200], self.y_train[100:200])
+        self.assertEqual(gb.estimator.estimators_.shape[0], 6)
+
+    def test_partial_fit_learner(self):
+        learner = online_learning.make_online(SGDRegressor(random_state=0), n_passes=5)
+        self.assertIsInstance(learner, online_learning.PartialFitLearner)
+        for X_chunk, y_chunk in online_learning.iter_chunks(self.X_train, self.y_train, 50):
+            learner.update(X_chunk, y_chunk)
+        self.assertEqual(learner.predict(self.X_test).shape, self.y_test.shape)
+        self.assertTrue(np.allclose(learner.scaler.mean_, self.X_train.mean(axis=0)))
+
+    def test_partial_fit_classifier_uses_all_classes(self):
+        X, y = load_wine(return_X_y=True)
+        order = np.argsort(y, kind='stable')  # first chunk only contains class 0
+        learner = online_learning.make_online(SGDClassifier(random_state=0), classes=np.unique(y))
+        for X_chunk, y_chunk in online_learning.iter_chunks(X[order], y[order], 30):
+            learner.update(X_chunk, y_chunk)
+        self.assertEqual(list(learner.estimator.classes_), [0, 1, 2])
+
+    def test_rejects_unsupported_estimator(self):
+        from sklearn.linear_model import Ridge
+        with self.assertRaises(TypeError):
+            online_learning.make_online(Ridge())
+
+    def test_benchmark_updates(self):
+        results = online_learning.benchmark_updates(online_learning.default_regressors(), self.X_train, self.y_train,
+                                                    self.X_test, self.y_test, chunk_size=100, trees_per_chunk=5)
+        self.assertEqual(list(results.index), ['SGD Regressor', 'Random Forest', 'Gradient Boosting'])
+        for column in ('update_s', 'retrain_s', 'speedup', 'online_score', 'retrain_score'):
+            self.assertIn(column, results.columns)
+        self.assertTrue((results['chunks'] == 4).all())
+
+if __name__ == "__main__":
+    unittest.main()
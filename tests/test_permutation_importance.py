@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_wine, make_regression
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import accuracy_score
+from data_science.permutation_importance import permutation_importance
+
+class TestPermutationImportance(unittest.TestCase):
+    def test_matches_naive_loop(self):
+        X, y = load_wine(return_X_y=True, as_frame=True)
+        model = RandomForestClassifier(n_estimators=20, random_state=0).fit(X[::2], y[::2])
+        X_test, y_test = X[1::2], y[1::2]
+        # small batch_rows and several threads exercise batching and the per-thread buffers
+        table = permutation_importance(model, X_test, y_test, n_repeats=4, batch_rows=150, n_jobs=3)
+        rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(0).spawn(X.shape[1])]
+        base = accuracy_score(y_test, model.predict(X_test))
+        values = X_test.to_numpy()
+        for j, name in enumerate(X.columns):
+            drops = []
+            for _ in range(4):
+                shuffled = values.copy()
+                shuffled[:, j] = values[rngs[j].permutation(len(values)), j]
+                drops.append(base - accuracy_score(y_test, model.predict(pd.DataFrame(shuffled, columns=X.columns))))
+            self.assertAlmostEqual(table.loc[name, 'importance_mean'], np.mean(drops))
+        self.assertTrue((table['n_repeats'] == 4).all())
+
+    def test_informative_features_rank_first_and_early_stop(self):
+        X, y = make_regression(n_samples=300, n_features=6, n_informative=2, noise=1.0, random_state=0)
+        model = LinearRegression().fit(X, y)
+        table = permutation_importance(model, X, y, min_repeats=5, max_repeats=50, tol=0.01)
+        informative = set(np.flatnonzero(np.abs(model.coef_) > 1))
+        self.assertEqual({int(name.split('_')[1]) for name in table.index[:2]}, informative)
+        self.assertLess(table['n_repeats'].sum(), 6 * 50)
+        self.assertTrue((table['ci_low'] <= table['importance_mean']).all())
+
+if __name__ == "__main__":
+    unittest.main()
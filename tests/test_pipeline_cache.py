@@ -0,0 +1,96 @@
+import unittest
+import copy
+import tempfile
+import os
+import numpy as np
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.datasets import load_iris
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import GridSearchCV
+from sklearn.pipeline import Pipeline
+from data_science import pipeline_cache
+from data_science.pipeline_cache import StepCache
+
+class CountingScaler(TransformerMixin, BaseEstimator):
+    fit_calls = 0
+
+    def fit(self, X, y=None):
+        CountingScaler.fit_calls += 1
+        self.mean_ = np.asarray(X).mean(axis=0)
+        return self
+
+    def transform(self, X):
+        return np.asarray(X) - self.mean_
+
+class TestPipelineCache(unittest.TestCase):
+    def setUp(self):
+        self.X, self.y = load_iris(return_X_y=True)
+        CountingScaler.fit_calls = 0
+
+    def test_grid_search_fits_transformer_once_per_fold(self):
+        cache = StepCache()
+        pipe = Pipeline([('scaler', CountingScaler()), ('rf', RandomForestClassifier(n_estimators=5, random_state=42))],
+                        memory=cache)
+        grid = GridSearchCV(pipe, {'rf__max_depth': [2, 3, 4]}, cv=3)
+        grid.fit(self.X, self.y)
+        # 3 folds + the final refit on the full data
+        self.assertEqual(CountingScaler.fit_calls, 4)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.hits, 6)
+
+    def test_matches_uncached_pipeline(self):
+        steps = [('scaler', CountingScaler()), ('rf', RandomForestClassifier(n_estimators=5, random_state=0))]
+        plain = Pipeline(steps).fit(self.X, self.y)
+        cached = pipeline_cache.cached_pipeline(steps).fit(self.X, self.y)
+        self.assertTrue(np.array_equal(plain.predict(self.X), cached.predict(self.X)))
+
+    def test_key_depends_on_params_and_input(self):
+        cache = StepCache()
+        func = cache.cache(lambda a, b=1: a * b)
+        self.assertTrue(np.array_equal(func(np.arange(3)), np.arange(3)))
+        func(np.arange(3))
+        func(np.arange(3), b=2)
+        func(np.arange(4))
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_lambdas_and_nested_functions_get_their_own_entries(self):
+        cache = StepCache()
+
+        def make(power):
+            def step(a):
+                return a ** power
+            return step
+
+        funcs = [cache.cache(lambda a: a + 1), cache.cache(lambda a: a + 2), cache.cache(lambda a: a.real),
+                 cache.cache(lambda a: a.imag), cache.cache(make(2)), cache.cache(make(3))]
+        self.assertEqual([func(2) for func in funcs], [3, 4, 2, 0, 4, 8])
+        self.assertEqual((cache.hits, cache.misses), (0, 6))
+        self.assertEqual(cache.cache(make(3))(2), 8)
+        self.assertEqual(cache.hits, 1)
+
+    def test_memory_bound_evicts_oldest(self):
+        cache = StepCache(max_entries=2)
+        func = cache.cache(lambda a: a + 1)
+        for i in range(3):
+            func(np.full(3, i))
+        self.assertEqual(len(cache), 2)
+        func(np.full(3, 0))
+        self.assertEqual(cache.misses, 4)
+
+    def test_disk_store_survives_new_instance(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            def double(a):
+                return a * 2
+            StepCache(location=tmp).cache(double)(np.arange(5))
+            self.assertEqual(len(os.listdir(tmp)), 1)
+            other = StepCache(location=tmp)
+            result = other.cache(double)(np.arange(5))
+            self.assertEqual(other.hits, 1)
+            self.assertTrue(np.array_equal(result, np.arange(5) * 2))
+
+    def test_deepcopy_shares_store(self):
+        cache = StepCache()
+        self.assertIs(copy.deepcopy(cache), cache)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_science.pivot_engine import PivotCache, group_codes, pivot_table
+
+
+def sales(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'region': rng.choice(['north', 'south', 'east'], n), 'store': rng.integers(0, 6, n),
+                          'channel': rng.choice(['web', 'shop'], n), 'units': rng.integers(1, 10, n),
+                          'revenue': rng.gamma(2.0, 30.0, n), 'weight': rng.random(n).astype(np.float32)})
+    frame.loc[rng.random(n) < 0.1, 'revenue'] = np.nan
+    frame.loc[rng.random(n) < 0.02, 'region'] = None
+    frame.loc[(frame['store'] == 2) & (frame['channel'] == 'web'), 'revenue'] = np.nan  # an all-missing cell
+    return frame[~((frame['store'] == 4) & (frame['region'] == 'east'))]  # an unobserved combination
+
+
+class TestGroupCodes(unittest.TestCase):
+    def test_codes_follow_sorted_observed_keys(self):
+        frame = pd.DataFrame({'a': ['y', 'x', None, 'y'], 'b': [2, 1, 1, 1]})
+        rows, inverse, group_index = group_codes(frame, ['a', 'b'])
+        np.testing.assert_array_equal(rows, [0, 1, 3])
+        self.assertListEqual(list(group_index), [('x', 1), ('y', 1), ('y', 2)])
+        np.testing.assert_array_equal(inverse, [2, 0, 1])
+
+
+class TestPivotCache(unittest.TestCase):
+    def test_matches_pivot_table(self):
+        frame = sales()
+        layouts = [('region', None), (['region', 'store'], None), ('region', 'store'), (['region', 'store'], 'channel'),
+                   (None, ['store', 'channel'])]
+        for index, columns in layouts:
+            cache = PivotCache(frame, index, columns)
+            for values in ('units', 'revenue', 'weight', ['units', 'revenue']):
+                for aggfunc in ('count', 'sum', 'mean', 'std', 'var', 'min', 'max', ['sum', 'mean']):
+                    for fill_value in (None, 0):
+                        with self.subTest(index=index, columns=columns, values=values, aggfunc=aggfunc,
+                                          fill_value=fill_value):
+                            expected = frame.pivot_table(values=values, index=index, columns=columns,
+                                                         aggfunc=aggfunc, fill_value=fill_value)
+                            pd.testing.assert_frame_equal(cache.pivot(values, aggfunc, fill_value), expected,
+                                                          check_exact=False)
+
+    def test_keeps_groupby_result_dtypes(self):
+        frame = sales(300)
+        frame = frame.assign(units_na=frame['units'].astype('Int64'), revenue_na=frame['revenue'].astype('Float64'),
+                             small=frame['units'].astype(np.int8), small_na=frame['units'].astype('UInt8'))
+        frame.loc[frame.index[::7], ['units_na', 'small_na']] = pd.NA
+        cache = PivotCache(frame, 'region', 'channel')
+        for values in ('units_na', 'revenue_na', 'small', 'small_na'):
+            for aggfunc in ('count', 'sum', 'mean', 'std', 'min', 'max'):
+                with self.subTest(values=values, aggfunc=aggfunc):
+                    expected = frame.pivot_table(values=values, index='region', columns='channel', aggfunc=aggfunc)
+                    pd.testing.assert_frame_equal(cache.pivot(values, aggfunc), expected, check_exact=False)
+        self.assertEqual(str(cache.pivot('units_na', 'sum').dtypes.iloc[0]), 'Int64')
+        self.assertEqual(str(cache.pivot('small_na', 'sum').dtypes.iloc[0]), 'UInt64')  # sums overflow UInt8
+
+    def test_statistics_are_memoised(self):
+        cache = PivotCache(sales(), 'region', 'channel')
+        mean = cache.stat('revenue', 'mean')
+        self.assertIs(cache.stat('revenue', 'mean'), mean)
+        self.assertIn(('revenue', 'sum'), cache._stats)
+        self.assertIn(('revenue', 'count'), cache._stats)
+
+    def test_one_off_and_default_values(self):
+        frame = sales().drop(columns='channel')
+        pd.testing.assert_frame_equal(pivot_table(frame, index='region', columns='store', aggfunc='max'),
+                                      frame.pivot_table(index='region', columns='store', aggfunc='max'))
+
+    def test_invalid_requests(self):
+        frame = sales()
+        with self.assertRaises(ValueError):
+            PivotCache(frame, None, None)
+        cache = PivotCache(frame, 'region')
+        with self.assertRaises(ValueError):
+            cache.pivot('units', 'median')
+        with self.assertRaises(TypeError):
+            cache.pivot('channel', 'sum')
+        pd.testing.assert_frame_equal(cache.pivot('channel', 'count'),
+                                      frame.pivot_table(values='channel', index='region', aggfunc='count'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_science.plot_aggregates import (category_counts, correlation_matrix, count_spec, histogram_counts,
+                                          histogram_spec, iter_frames)
+from data_science.seaborn_intro import large_frame_plots
+
+class TestPlotAggregates(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 5000
+        self.frame = pd.DataFrame({'class': rng.choice(['First', 'Second', 'Third'], n),
+                                   'sex': rng.choice(['female', 'male'], n),
+                                   'age': rng.gamma(6.0, 5.0, n), 'fare': rng.lognormal(3.0, 0.8, n)})
+        self.frame.loc[::11, 'age'] = np.nan
+        self.chunks = lambda: iter_frames(self.frame, 700)
+
+    def test_category_counts_match_crosstab(self):
+        expected = pd.crosstab(self.frame['class'], self.frame['sex'])
+        for data in (self.frame, self.chunks):
+            counts = category_counts(data, 'class', hue='sex', chunk_size=1000)
+            self.assertTrue(np.array_equal(counts.to_numpy(), expected.to_numpy()))
+        single = category_counts(self.frame, 'sex')
+        self.assertEqual(list(single['count']), list(self.frame['sex'].value_counts().sort_index()))
+
+    def test_histogram_counts_match_numpy(self):
+        hist = histogram_counts(self.chunks, 'age', bins=20, by='sex')
+        self.assertEqual(hist.groups, ['female', 'male'])
+        for group, counts in zip(hist.groups, hist.counts):
+            expected, _ = np.histogram(self.frame.loc[self.frame['sex'] == group, 'age'].dropna(), bins=hist.edges)
+            self.assertTrue(np.array_equal(counts, expected))
+        self.assertEqual(hist.total().sum(), self.frame['age'].notna().sum())
+        clipped = histogram_counts(self.frame, 'age', bins=10, range=(0, 20))
+        self.assertEqual(clipped.total().sum(), self.frame['age'].between(0, 20).sum())
+
+    def test_correlation_matches_pandas(self):
+        corr = correlation_matrix(self.chunks)
+        expected = self.frame.corr(numeric_only=True)
+        self.assertTrue(np.allclose(corr.to_numpy(), expected.to_numpy()))
+
+    def test_specs_and_rendering(self):
+        hist = histogram_counts(self.frame, 'age', by='class')
+        self.assertEqual(len(histogram_spec(hist, 'h')['panels']), 3)
+        self.assertEqual(histogram_spec(hist, 'h', facet=False)['kind'], 'stairs')
+        self.assertEqual(count_spec(category_counts(self.frame, 'class'), 'c')['kind'], 'grouped_bar')
+        with tempfile.TemporaryDirectory() as tmp:
+            report = large_frame_plots(self.frame, tmp, chunk_size=1500)
+            self.assertEqual(len(report), 3)
+            self.assertTrue(report['error'].isna().all())
+
+if __name__ == "__main__":
+    unittest.main()
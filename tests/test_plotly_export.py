@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from data_science import data_visualization
+from data_science.plotly_export import density_sample, export_dashboard, scatter_figure
+
+class TestDensitySample(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 50000
+        self.frame = pd.DataFrame({'x': rng.standard_normal(n), 'y': rng.standard_normal(n),
+                                   'group': rng.choice(['a', 'b'], n)})
+        # a handful of far-away outliers a uniform sample would almost surely drop
+        self.frame.loc[:9, 'x'] = self.frame.loc[:9, 'y'] = 40.0 + np.arange(10)
+        self.core = (self.frame['x'].abs() < 1) & (self.frame['y'].abs() < 1)
+
+    def test_small_input_is_kept_whole(self):
+        self.assertEqual(density_sample(np.arange(5.0), np.arange(5.0), 10).tolist(), [0, 1, 2, 3, 4])
+
+    def test_sample_size_and_outliers(self):
+        rows = density_sample(self.frame['x'], self.frame['y'], 2000)
+        self.assertLess(abs(len(rows) - 2000), 200)
+        self.assertTrue((np.diff(rows) > 0).all())
+        self.assertTrue(set(range(10)) <= set(rows.tolist()))
+
+    def test_default_preserves_density_and_alpha_flattens_it(self):
+        rows = density_sample(self.frame['x'], self.frame['y'], 5000)
+        self.assertTrue(set(range(10)) <= set(rows.tolist()))
+        # only the one-point-per-cell floor pulls the dense core's share below the full data's
+        self.assertAlmostEqual(self.core.iloc[rows].mean(), self.core.mean(), delta=0.05)
+        share = [self.core.iloc[density_sample(self.frame['x'], self.frame['y'], 5000, alpha=alpha)].mean()
+                 for alpha in (0.0, 0.5, 1.0)]
+        self.assertEqual(share[0], self.core.iloc[rows].mean())
+        self.assertGreater(share[0], share[1])
+        self.assertGreater(share[1], share[2])
+
+class TestPlotlyExport(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 20000
+        self.frame = pd.DataFrame({'x': rng.standard_normal(n), 'y': rng.standard_normal(n),
+                                   'group': rng.choice(['a', 'b'], n)})
+
+    def test_scatter_figure_uses_webgl_float32_traces(self):
+        fig = scatter_figure(self.frame, 'x', 'y', color='group', max_points=3000)
+        self.assertEqual([trace.type for trace in fig.data], ['scattergl', 'scattergl'])
+        self.assertEqual([trace.name for trace in fig.data], ['a', 'b'])
+        self.assertEqual(np.asarray(fig.data[0].x).dtype, np.float32)
+        self.assertLess(sum(len(trace.x) for trace in fig.data), 3500)
+
+    def test_dashboard_shares_one_plotly_bundle(self):
+        figures = {'xy': scatter_figure(self.frame, 'x', 'y', max_points=1000),
+                   'yx': scatter_figure(self.frame, 'y', 'x', max_points=1000)}
+        with tempfile.TemporaryDirectory() as tmp:
+            report = export_dashboard(figures, tmp)
+            self.assertEqual(sorted(os.listdir(tmp)), ['plotly.min.js', 'xy.html', 'yx.html'])
+            self.assertTrue((report['bytes'] < 200000).all())
+            self.assertGreater(report.attrs['shared_js_bytes'], 1000000)
+            with open(os.path.join(tmp, 'xy.html')) as f:
+                self.assertIn('src="plotly.min.js"', f.read())
+
+    def test_plot_plotly_writes_html(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'iris.html')
+            fig = data_visualization.plot_plotly(path)
+            self.assertTrue(os.path.exists(path))
+            self.assertEqual(sum(len(trace.x) for trace in fig.data), 150)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from matplotlib.image import AxesImage
+from data_science.prediction_plots import bin_2d, downsample, plot_actual_vs_predicted, regression_summary
+
+class TestPredictionPlots(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.actual = rng.normal(100, 20, size=50000)
+        self.predicted = self.actual + rng.normal(0, 5, size=self.actual.shape)
+
+    def test_bin_2d_matches_histogram2d(self):
+        x = np.arange(100) % 10 + 0.5
+        y = np.arange(100) // 10 + 0.5
+        counts, x_edges, y_edges = bin_2d(x, y, bins=(5, 10), extent=(0, 10, 0, 10), chunk_rows=7)
+        expected, _, _ = np.histogram2d(x, y, bins=[x_edges, y_edges])
+        self.assertTrue(np.array_equal(counts, expected))
+        self.assertEqual(bin_2d([0.0, 1.0, np.nan, 5.0], [0.0, 1.0, 1.0, 5.0], bins=2, extent=(0, 1, 0, 1))[0].sum(), 2)
+
+    def test_downsample_and_summary(self):
+        xs, ys = downsample(self.actual, self.predicted, 1000)
+        self.assertEqual(len(xs), 1000)
+        self.assertTrue(np.array_equal(ys - xs, (self.predicted - self.actual)[np.isin(self.actual, xs)]))
+        stats = regression_summary(self.actual, self.predicted)
+        self.assertAlmostEqual(stats['rmse'], np.sqrt(np.mean((self.predicted - self.actual) ** 2)))
+        self.assertGreater(stats['r2'], 0.9)
+
+    def test_large_input_renders_density_to_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'avp.png')
+            fig = plot_actual_vs_predicted(self.actual, self.predicted, path=path, max_points=1000)
+            self.assertTrue(os.path.getsize(path) > 0)
+            self.assertTrue(any(isinstance(a, AxesImage) for a in fig.axes[0].get_children()))
+            fig = plot_actual_vs_predicted(self.actual[:500], self.predicted[:500], path=os.path.join(tmp, 'a.svg'))
+            self.assertEqual(len(fig.axes[0].collections[0].get_offsets()), 500)
+        with self.assertRaises(ValueError):
+            plot_actual_vs_predicted(self.actual, self.predicted, method='hexbin')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from sklearn.datasets import load_wine
+from sklearn.ensemble import RandomForestClassifier
+from data_science import prediction_server
+
+class TestPredictionServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.X, y = load_wine(return_X_y=True)
+        cls.model = RandomForestClassifier(n_estimators=10, random_state=42).fit(cls.X, y)
+
+    def test_micro_batcher_coalesces_concurrent_rows(self):
+        calls = []
+
+        def predict(batch):
+            calls.append(len(batch))
+            time.sleep(0.005)
+            return self.model.predict(batch)
+
+        batcher = prediction_server.MicroBatcher(predict, max_batch_size=16, max_latency_ms=20)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(batcher.predict, self.X[:64]))
+        batcher.close()
+        self.assertTrue(np.array_equal(results, self.model.predict(self.X[:64])))
+        self.assertLess(len(calls), 64)
+        self.assertLessEqual(max(calls), 16)
+        metrics = batcher.metrics()
+        self.assertEqual(metrics['requests'], 64)
+        self.assertGreater(metrics['batch_size_mean'], 1)
+        self.assertGreaterEqual(metrics['latency_p99_ms'], metrics['latency_p50_ms'])
+
+    def test_errors_reach_callers(self):
+        def broken(batch):
+            raise ValueError('bad input')
+
+        batcher = prediction_server.MicroBatcher(broken, max_latency_ms=1)
+        with self.assertRaises(ValueError):
+            batcher.predict([1.0, 2.0], timeout=5)
+        batcher.close()
+
+    def test_short_prediction_batches_fail_every_caller(self):
+        batcher = prediction_server.MicroBatcher(lambda batch: batch[:-1, 0], max_batch_size=4, max_latency_ms=50)
+        futures = [batcher.submit(row) for row in self.X[:4]]
+        for future in futures:
+            with self.assertRaises(ValueError):
+                future.result(timeout=5)
+        batcher.close()
+
+    def test_wrong_width_rows_fail_alone(self):
+        batcher = prediction_server.MicroBatcher(self.model.predict, max_batch_size=8, max_latency_ms=50)
+        good, bad = batcher.submit(self.X[0]), batcher.submit(self.X[0, :5])
+        self.assertEqual(good.result(timeout=5), self.model.predict(self.X[:1])[0])
+        with self.assertRaises(ValueError):
+            bad.result(timeout=5)
+        batcher.close()
+        checked = prediction_server.MicroBatcher(self.model.predict, n_features=13)
+        with self.assertRaises(ValueError):
+            checked.submit(self.X[0, :5])
+        checked.close()
+
+    def test_submit_after_close_raises(self):
+        batcher = prediction_server.MicroBatcher(self.model.predict, max_latency_ms=1)
+        self.assertEqual(batcher.predict(self.X[0], timeout=5), self.model.predict(self.X[:1])[0])
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit(self.X[0])
+
+    def test_http_round_trip(self):
+        service = prediction_server.PredictionService({'wine_rf': self.model}, max_latency_ms=2)
+        server = prediction_server.serve(service, port=0)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base = 'http://127.0.0.1:{}'.format(server.server_address[1])
+        try:
+            request = urllib.request.Request(base + '/predict/wine_rf', method='POST',
+                                             data=json.dumps({'features': self.X[0].tolist()}).encode())
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(json.load(response)['prediction'], int(self.model.predict(self.X[:1])[0]))
+            request = urllib.request.Request(base + '/predict/wine_rf', method='POST',
+                                             data=json.dumps({'instances': self.X[:3].tolist()}).encode())
+            with urllib.request.urlopen(request) as response:
+                self.assertEqual(json.load(response)['predictions'], self.model.predict(self.X[:3]).tolist())
+            with urllib.request.urlopen(base + '/metrics') as response:
+                self.assertEqual(json.load(response)['wine_rf']['requests'], 1)
+            with urllib.request.urlopen(base + '/models') as response:
+                self.assertEqual(json.load(response)['wine_rf']['n_features'], 13)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+    def test_from_paths_skips_missing_files(self):
+        service = prediction_server.PredictionService.from_paths({'missing': 'does_not_exist.joblib'})
+        self.assertEqual(service.models, {})
+        service.close()
+
+if __name__ == "__main__":
+    unittest.main()
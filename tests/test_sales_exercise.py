@@ -1,3 +1,7 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
 import pandas as pd
 
@@ -11,5 +15,12 @@ class TestSalesExercise(unittest.TestCase):
         sales = pd.read_json('data_science/datasets/sales.json')
         self.assertEqual(sales['revenue'].sum(), 575.0)
 
+    def test_runs_by_path_from_any_directory(self):
+        script = os.path.abspath('data_science/datasets/sales_exercise.py')
+        with tempfile.TemporaryDirectory() as tmp:
+            result = subprocess.run([sys.executable, script], cwd=tmp, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('Widget     425', result.stdout)
+
 if __name__ == '__main__':
     unittest.main()
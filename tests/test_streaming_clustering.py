@@ -0,0 +1,37 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from sklearn.datasets import make_blobs
+from sklearn.metrics import adjusted_rand_score
+from data_science import streaming_clustering as sc
+
+class TestStreamingClustering(unittest.TestCase):
+    def setUp(self):
+        self.X, self.y = make_blobs(n_samples=3000, n_features=8, centers=4, random_state=0)
+
+    def test_batch_assigner_matches_kmeans_labels(self):
+        assigner, labels = sc.batch_pca_kmeans(self.X, n_components=3, n_clusters=4)
+        self.assertTrue(np.array_equal(assigner.predict(self.X), labels))
+
+    def test_streaming_recovers_clusters_from_chunk_iterator(self):
+        chunks = lambda: (self.X[i:i + 250] for i in range(0, len(self.X), 250))
+        model = sc.StreamingPCAKMeans(n_components=3, n_clusters=4).fit(chunks)
+        self.assertGreater(adjusted_rand_score(self.y, model.predict(self.X)), 0.95)
+
+    def test_save_and_load_assigner(self):
+        model = sc.StreamingPCAKMeans(n_components=2, n_clusters=4, chunk_size=401).fit(self.X)
+        with tempfile.TemporaryDirectory() as tmp:
+            model.save(os.path.join(tmp, 'clusters'))
+            loaded = sc.load_assigner(os.path.join(tmp, 'clusters'))
+            self.assertTrue(np.array_equal(loaded.predict(self.X), model.predict(self.X)))
+            self.assertTrue(np.allclose(loaded.transform(self.X[:5]), model.pca_.transform(model.scaler_.transform(self.X[:5]))))
+            del loaded
+
+    def test_benchmark_table(self):
+        table = sc.benchmark_clustering(self.X, n_components=2, n_clusters=4, chunk_size=500)
+        self.assertEqual(list(table.index), ['batch', 'streaming'])
+        self.assertLess(table.loc['streaming', 'inertia'], table.loc['batch', 'inertia'] * 1.1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from data_science.streaming_timeseries import RollingWindow, StreamingResampler, resample_stream, rolling_stream
+
+
+def irregular_frame(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    seconds = np.sort(rng.integers(0, 2 * 86400, n))  # gaps and repeated timestamps
+    frame = pd.DataFrame({'temperature': rng.normal(20, 3, n), 'humidity': rng.normal(60, 5, n)},
+                         index=pd.DatetimeIndex(np.datetime64('2024-05-01T03:10', 'ns') + seconds * 10**9))
+    frame[rng.random(frame.shape) < 0.1] = np.nan
+    return frame
+
+
+class TestStreamingResample(unittest.TestCase):
+    def test_matches_pandas_across_chunk_sizes(self):
+        frame = irregular_frame()
+        aggs = ['count', 'sum', 'mean', 'std', 'min', 'max']
+        for freq in ('7min', 'h'):
+            expected = frame.resample(freq).agg(aggs)
+            for chunk_size in (50, 1000, len(frame)):
+                ours = resample_stream(frame, freq, aggs, chunk_size=chunk_size)
+                pd.testing.assert_frame_equal(ours[expected.columns], expected, check_dtype=False, check_freq=False, atol=1e-9)
+
+    def test_tz_aware_bins_follow_local_midnight(self):
+        index = pd.date_range('2024-03-08 13:17', periods=6000, freq='7min', tz='US/Eastern', unit='ns')  # DST on 03-10
+        frame = pd.DataFrame({'load': np.random.default_rng(0).random(6000)}, index=index)
+        for freq in ('5h', 'D'):
+            expected = frame.resample(freq).agg(['count', 'mean', 'max'])
+            ours = resample_stream(frame, freq, ('count', 'mean', 'max'), chunk_size=500)
+            self.assertEqual(str(ours.index.tz), 'US/Eastern')
+            pd.testing.assert_frame_equal(ours[expected.columns], expected, check_freq=False, atol=1e-9)
+        self.assertEqual(str(ours.index[0]), '2024-03-08 00:00:00-05:00')
+        rolled = pd.concat(rolling_stream(frame, '2h', ('mean',), chunk_size=700))
+        pd.testing.assert_frame_equal(rolled, frame.rolling('2h').agg(['mean']), check_freq=False)
+
+    def test_update_emits_only_closed_bins(self):
+        frame = irregular_frame()
+        resampler = StreamingResampler('h', aggs=('count',))
+        first = resampler.update(frame.iloc[:100])
+        self.assertLess(first.index[-1], frame.index[99].floor('h'))
+        rest = pd.concat([resampler.update(frame.iloc[100:]), resampler.flush()])
+        self.assertEqual(int(pd.concat([first, rest])['temperature', 'count'].sum()), frame['temperature'].count())
+
+    def test_rejects_calendar_frequency_and_unsorted_chunks(self):
+        with self.assertRaises(ValueError):
+            StreamingResampler('MS')
+        frame = irregular_frame()
+        resampler = StreamingResampler('h')
+        resampler.update(frame.iloc[100:200])
+        with self.assertRaises(ValueError):
+            resampler.update(frame.iloc[:100])
+
+
+class TestStreamingRolling(unittest.TestCase):
+    def test_time_window_matches_pandas(self):
+        frame = irregular_frame()
+        aggs = ['mean', 'std', 'min', 'max', 'sum']
+        expected = frame.rolling('45min').agg(aggs)
+        for chunk_size in (7, 500, len(frame)):
+            ours = pd.concat(rolling_stream(frame, '45min', aggs, chunk_size=chunk_size))
+            pd.testing.assert_frame_equal(ours[expected.columns], expected, check_dtype=False, check_freq=False, atol=1e-9)
+
+    def test_count_window_matches_pandas(self):
+        frame = irregular_frame().reset_index(drop=True)
+        expected = frame.rolling(20).agg(['mean', 'min', 'max'])
+        ours = pd.concat(rolling_stream(frame, 20, ('mean', 'min', 'max'), min_periods=20, chunk_size=64))
+        pd.testing.assert_frame_equal(ours[expected.columns], expected, check_dtype=False, check_freq=False, atol=1e-9)
+
+    def test_state_is_bounded_by_window(self):
+        frame = irregular_frame()
+        roller = RollingWindow('10min')
+        for start in range(0, len(frame), 250):
+            roller.update(frame.iloc[start:start + 250])
+            self.assertLessEqual(roller.tail_keys[-1] - roller.tail_keys[0], pd.Timedelta('10min').value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data_science.timeseries_plots import lttb_indices, minmax_indices, plot_timeseries
+
+
+def random_walk(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.datetime64('2024-01-01T00:00') + np.arange(n).astype('timedelta64[m]')
+    return x, rng.standard_normal(n).cumsum()
+
+
+class TestDownsampling(unittest.TestCase):
+    def test_minmax_keeps_bucket_envelope(self):
+        x, y = random_walk(100000)
+        rows = minmax_indices(x, y, 250)
+        self.assertLessEqual(len(rows), 4 * 250)
+        self.assertTrue(np.all(np.diff(rows) > 0))
+        self.assertEqual((rows[0], rows[-1]), (0, len(y) - 1))
+        bucket = np.minimum(np.arange(len(y)) * 250 // (len(y) - 1), 249)
+        for b in (0, 17, 249):
+            full, kept = y[bucket == b], y[rows][bucket[rows] == b]
+            self.assertEqual((full.min(), full.max()), (kept.min(), kept.max()))
+
+    def test_lttb_size_and_spikes(self):
+        x, y = random_walk(50000)
+        y[12345] = y.max() + 100
+        rows = lttb_indices(x, y, 500)
+        self.assertEqual(len(rows), 500)
+        self.assertTrue(np.all(np.diff(rows) > 0))
+        self.assertIn(12345, rows)
+
+    def test_missing_values_and_short_series(self):
+        y = np.array([1.0, np.nan, 3.0, 2.0])
+        np.testing.assert_array_equal(lttb_indices(np.arange(4), y, 10), [0, 2, 3])
+        np.testing.assert_array_equal(minmax_indices(np.arange(4), y, 10), [0, 2, 3])
+
+
+class TestPlotTimeseries(unittest.TestCase):
+    def test_draws_at_most_four_points_per_pixel(self):
+        x, y = random_walk(200000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'series.png')
+            fig = plot_timeseries(x, y, path=path, figsize=(6, 3), dpi=100)
+            self.assertTrue(os.path.exists(path))
+        drawn = len(fig.axes[0].lines[0].get_xdata())
+        self.assertLessEqual(drawn, 4 * 600)
+        self.assertEqual(fig.axes[0].lines[0].get_xdata().dtype, x.dtype)
+
+    def test_short_series_drawn_whole(self):
+        x, y = random_walk(50)
+        fig = plot_timeseries(x, y, method='lttb')
+        self.assertEqual(len(fig.axes[0].lines[0].get_xdata()), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import numpy as np
+from sklearn.datasets import load_digits, load_diabetes, load_iris
+from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, GradientBoostingClassifier
+from data_science import tree_inference
+
+class TestTreeInference(unittest.TestCase):
+    def test_blocks_match_one_batch(self):
+        X, y = load_digits(return_X_y=True)
+        clf = RandomForestClassifier(n_estimators=25, random_state=42).fit(X, y)
+        proba = tree_inference.batch_predict(clf, X, 'predict_proba', block_size=100)
+        self.assertTrue(np.array_equal(proba, clf.predict_proba(X)))
+        self.assertTrue(np.array_equal(tree_inference.batch_predict(clf, X, block_size=100), clf.predict(X)))
+
+    def test_threads_give_same_result(self):
+        X, y = load_diabetes(return_X_y=True)
+        reg = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+        self.assertTrue(np.array_equal(tree_inference.batch_predict(reg, X, block_size=50, n_jobs=3), reg.predict(X)))
+
+    def test_decision_function_blocks(self):
+        X, y = load_iris(return_X_y=True)
+        clf = GradientBoostingClassifier(n_estimators=10, random_state=42).fit(X, y)
+        raw = tree_inference.batch_predict(clf, X, 'decision_function', block_size=32, n_jobs=2)
+        self.assertTrue(np.array_equal(raw, clf.decision_function(X)))
+        with self.assertRaises(ValueError):
+            tree_inference.batch_predict(clf, X, 'score')
+
+    def test_benchmark_throughput(self):
+        X, y = load_iris(return_X_y=True)
+        clf = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        results = tree_inference.benchmark_throughput(clf, X, repeats=1, row_by_row=10)
+        self.assertTrue(results['identical'])
+        self.assertGreater(results['blocked_rows_per_s'], results['sklearn_row_by_row_rows_per_s'])
+
+if __name__ == "__main__":
+    unittest.main()